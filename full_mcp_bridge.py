@@ -19,6 +19,10 @@ try:
     import paramiko  # type: ignore
 except Exception:
     paramiko = None
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -608,7 +612,7 @@ class FullMCPRequestHandler(BaseHTTPRequestHandler):
     def send_json_response(self, status_code: int, data: Any):
         """Send a JSON response."""
         try:
-            body = json.dumps(data).encode('utf-8')
+            body = _json_dumps(data)
         except Exception:
             body = b'{}'
         self.send_response(status_code)
@@ -625,6 +629,16 @@ class FullMCPRequestHandler(BaseHTTPRequestHandler):
         """Override to reduce log noise."""
         pass
 
+def _json_dumps(data: Any) -> bytes:
+    """Serialize data to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder copes
+    return json.dumps(data).encode('utf-8')
+
+
 def create_handler(bridge):
     """Create a request handler with the bridge instance."""
     def handler(*args, **kwargs):
@@ -96,6 +96,15 @@ class AIShowmakerMCPServer(ABC):
         self.tools[tool.name] = tool
         self.logger.info(f"Registered tool: {tool.name}")
         
+    def register_tools(self, tools: List[MCPTool]) -> None:
+        """Register several tools with the MCP server in one update."""
+        for tool in tools:
+            if tool.name in self.tools:
+                self.logger.warning(f"Tool '{tool.name}' already registered. Overwriting.")
+        
+        self.tools.update({tool.name: tool for tool in tools})
+        self.logger.info(f"Registered {len(tools)} tools: {', '.join(tool.name for tool in tools)}")
+        
     def get_tool(self, name: str) -> Optional[MCPTool]:
         """Get a registered tool by name."""
         return self.tools.get(name)
@@ -6,19 +6,152 @@ security validation, and comprehensive error handling.
 Includes repository management for remote development.
 """
 
+import asyncio
+import functools
+import io
 import os
 import json
+import re
+import select
+import socket
+import shlex
+import tarfile
 import time
 import paramiko
+import queue
 import threading
+import uuid
 from contextlib import contextmanager
-from pathlib import Path
-from typing import Dict, Any, Optional, List
+from pathlib import PurePosixPath
+from typing import Dict, Any, Optional, List, Tuple
 
 from mcp_servers.base.server import AIShowmakerMCPServer, MCPTool
 from core.exceptions import SecurityError, ConnectionError
 
 
+# Ollama HTTP API address on the remote host
+_OLLAMA_ADDRESS = ("127.0.0.1", 11434)
+
+# Starts a persistent 'ollama serve' unless one is running, then waits until
+# the API answers; the exit status reports whether the server is reachable
+_OLLAMA_ENSURE_SERVER_CMD = (
+    "pgrep -x ollama >/dev/null || { nohup ollama serve >/tmp/ollama-serve.log 2>&1 & "
+    "for i in 1 2 3 4 5 6 7 8 9 10; do ollama list >/dev/null 2>&1 && break; sleep 0.5; done; }; "
+    "ollama list >/dev/null 2>&1"
+)
+
+# Separates per-step output when several git commands share one exec
+_GIT_STEP_MARKER = "---AI-SHOWMAKER-GIT-STEP---"
+
+# Shapes of a git subcommand and of an option name; both are placed in the
+# shell command unquoted
+_GIT_OPERATION_RE = re.compile(r'^[a-z][a-z-]*$')
+_GIT_OPTION_RE = re.compile(r'^-{1,2}[A-Za-z0-9][A-Za-z0-9-]*$')
+
+
+# Upper bound on command or file output handed back to the model
+_MAX_OUTPUT_BYTES = 256 * 1024
+_TRUNCATED_MARKER = "...[truncated]\n"
+
+# Largest read/write paramiko sends in a single SFTP request
+_SFTP_REQUEST_SIZE = 32768
+
+# From this many files on, write_files streams one tar archive over an exec
+# channel instead of opening, writing and closing each file over SFTP
+_TAR_BATCH_MIN_FILES = 8
+
+
+def _cap_text(text: str, limit: int = _MAX_OUTPUT_BYTES) -> str:
+    """Cut text to limit characters, marking the cut."""
+    if len(text) <= limit:
+        return text
+    return text[:limit] + "\n" + _TRUNCATED_MARKER
+
+
+def _drain_channel(channel, chunk_size: int = 32768,
+                   limit: Optional[int] = None,
+                   timeout: Optional[float] = None) -> Tuple[int, bytes, bytes]:
+    """Read stdout and stderr of an exec channel together until the command exits.
+    
+    Draining both streams as data arrives keeps a full stderr window from
+    stalling a remote process that is still writing stdout (and vice versa).
+    With a limit, only the first limit bytes of each stream are kept; the
+    rest is still drained so the exit status arrives, then discarded.
+    timeout bounds the whole command (None waits indefinitely); when it
+    passes, the channel is closed and socket.timeout raised.
+    Returns (exit_code, stdout_bytes, stderr_bytes).
+    """
+    out, err = bytearray(), bytearray()
+    cut = [False, False]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    
+    def keep(buf, chunk, index):
+        if limit is None or len(buf) + len(chunk) <= limit:
+            buf += chunk
+        else:
+            buf += chunk[:max(limit - len(buf), 0)]
+            cut[index] = True
+    
+    while not channel.exit_status_ready():
+        # Checked on every pass: a command that never stops writing is
+        # never idle
+        if deadline is not None and time.monotonic() > deadline:
+            channel.close()
+            raise socket.timeout(f"Command did not finish within {timeout}s")
+        idle = True
+        if channel.recv_ready():
+            keep(out, channel.recv(chunk_size), 0)
+            idle = False
+        if channel.recv_stderr_ready():
+            keep(err, channel.recv_stderr(chunk_size), 1)
+            idle = False
+        if idle:
+            select.select([channel], [], [], 1.0)
+    
+    # The process has exited, so whatever is left can be read to EOF
+    while True:
+        chunk = channel.recv(chunk_size)
+        if not chunk:
+            break
+        keep(out, chunk, 0)
+    while True:
+        chunk = channel.recv_stderr(chunk_size)
+        if not chunk:
+            break
+        keep(err, chunk, 1)
+    
+    marker = ("\n" + _TRUNCATED_MARKER).encode()
+    if cut[0]:
+        out += marker
+    if cut[1]:
+        err += marker
+    return channel.recv_exit_status(), bytes(out), bytes(err)
+
+
+def _sftp_makedirs(sftp: paramiko.SFTPClient, path: str) -> None:
+    """'mkdir -p' over an open SFTP session.
+    
+    Stats upward from path until an existing directory is found, then
+    creates the missing ones top-down; an existing path costs one request.
+    """
+    missing = []
+    current = PurePosixPath(path)
+    while str(current) not in ('.', '/'):
+        try:
+            sftp.stat(str(current))
+            break
+        except IOError:
+            missing.append(current)
+            current = current.parent
+    
+    for directory in reversed(missing):
+        try:
+            sftp.mkdir(str(directory))
+        except IOError:
+            # Created concurrently by another writer
+            sftp.stat(str(directory))
+
+
 class RepositoryManager:
     """Manages repositories on the remote server."""
     
@@ -27,57 +160,100 @@ class RepositoryManager:
         self.workspace_path = "/home/ec2-user/workspace"
         self.current_repo = None
         self.repositories = {}
+        # Repository names already confirmed to be git checkouts
+        self._validated_repos = set()
+        # Short-lived cache of repository listings: path -> (timestamp, names)
+        self.repo_list_ttl = 5.0
+        self._repo_list_cache = {}
+        # 'git status' captured while switching: repo -> (timestamp, step)
+        self.status_snapshot_ttl = 2.0
+        self._status_snapshot = {}
+        # Time a workspace or git command may run; clones of large
+        # repositories need more than a shell command
+        self.command_timeout = 600.0
     
     async def initialize_workspace(self) -> str:
         """Initialize the workspace directory on remote server."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                # Create workspace directory
-                ssh.exec_command(f"mkdir -p {self.workspace_path}")
-                ssh.exec_command(f"chmod 755 {self.workspace_path}")
-                
-                # Create repositories subdirectory
-                repos_path = f"{self.workspace_path}/repositories"
-                ssh.exec_command(f"mkdir -p {repos_path}")
-                
-                return f"Workspace initialized at {self.workspace_path}"
+            # Create workspace and repositories directories in one round trip
+            repos_path = f"{self.workspace_path}/repositories"
+            exit_code, _, error = await self._exec(
+                f"mkdir -p {repos_path} && chmod 755 {self.workspace_path} {repos_path}"
+            )
+            
+            if exit_code != 0:
+                raise Exception(error)
+            
+            return f"Workspace initialized at {self.workspace_path}"
         except Exception as e:
             raise Exception(f"Failed to initialize workspace: {str(e)}")
     
+    def _sync_exec(self, command: str, limit: int = _MAX_OUTPUT_BYTES) -> Tuple[int, str, str]:
+        """Run one command on a pooled connection and return (exit_code, stdout, stderr).
+        
+        Each stream keeps at most limit bytes and is marked when cut.
+        """
+        def run(ssh):
+            stdin, stdout, stderr = ssh.exec_command(command)
+            exit_code, stdout_bytes, stderr_bytes = _drain_channel(
+                stdout.channel, limit=limit, timeout=self.command_timeout
+            )
+            return (
+                exit_code,
+                stdout_bytes.decode('utf-8', errors='replace'),
+                stderr_bytes.decode('utf-8', errors='replace')
+            )
+        
+        return self.ssh_pool.run(run)
+    
+    async def _exec(self, command: str, limit: int = _MAX_OUTPUT_BYTES) -> Tuple[int, str, str]:
+        """Run a command in the executor so independent commands can overlap.
+        
+        Concurrent calls each check out their own pooled connection.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._sync_exec, command, limit)
+    
     async def clone_repository(self, repo_url: str, repo_name: str, auth_token: str = None) -> str:
         """Clone a repository to the remote workspace."""
         try:
-            repo_path = f"{self.workspace_path}/repositories/{repo_name}"
+            repos_path = f"{self.workspace_path}/repositories"
+            repo_path = f"{repos_path}/{repo_name}"
             
-            with self.ssh_pool.get_connection() as ssh:
-                # Check if repository already exists
-                stdin, stdout, stderr = ssh.exec_command(f"test -d {repo_path} && echo 'exists'")
-                if stdout.read().decode().strip() == 'exists':
-                    return f"Repository '{repo_name}' already exists at {repo_path}"
-                
-                # Clone repository
-                if auth_token:
-                    # Use token authentication
-                    if repo_url.startswith('https://'):
-                        # For HTTPS with token
-                        auth_url = repo_url.replace('https://', f'https://{auth_token}@')
-                    else:
-                        # For SSH with token (less common)
-                        auth_url = repo_url
-                    
-                    clone_cmd = f"cd {self.workspace_path}/repositories && git clone {auth_url} {repo_name}"
+            # Check for an existing checkout while making sure the
+            # repositories directory exists; neither depends on the other
+            (exists_code, _, _), (mkdir_code, _, mkdir_err) = await asyncio.gather(
+                self._exec(f"test -d {shlex.quote(repo_path)}"),
+                self._exec(f"mkdir -p {shlex.quote(repos_path)}")
+            )
+            if exists_code == 0:
+                return f"Repository '{repo_name}' already exists at {repo_path}"
+            if mkdir_code != 0:
+                raise Exception(f"Failed to create {repos_path}: {mkdir_err}")
+            
+            # Clone repository
+            if auth_token:
+                # Use token authentication
+                if repo_url.startswith('https://'):
+                    # For HTTPS with token
+                    auth_url = repo_url.replace('https://', f'https://{auth_token}@')
                 else:
-                    clone_cmd = f"cd {self.workspace_path}/repositories && git clone {repo_url} {repo_name}"
-                
-                stdin, stdout, stderr = ssh.exec_command(clone_cmd)
-                exit_code = stdout.channel.recv_exit_status()
+                    # For SSH with token (less common)
+                    auth_url = repo_url
                 
-                if exit_code == 0:
-                    self.repositories[repo_name] = repo_path
-                    return f"Repository '{repo_name}' cloned successfully to {repo_path}"
-                else:
-                    error = stderr.read().decode('utf-8', errors='replace')
-                    raise Exception(f"Failed to clone repository: {error}")
+                clone_cmd = f"git -C {shlex.quote(repos_path)} clone {shlex.quote(auth_url)} {shlex.quote(repo_name)}"
+            else:
+                clone_cmd = f"git -C {shlex.quote(repos_path)} clone {shlex.quote(repo_url)} {shlex.quote(repo_name)}"
+            
+            exit_code, _, error = await self._exec(clone_cmd)
+            
+            if exit_code == 0:
+                self.repositories[repo_name] = repo_path
+                self._validated_repos.discard(repo_name)
+                self._repo_list_cache.clear()
+                return f"Repository '{repo_name}' cloned successfully to {repo_path}"
+            else:
+                raise Exception(f"Failed to clone repository: {error}")
                     
         except Exception as e:
             raise Exception(f"Repository cloning failed: {str(e)}")
@@ -85,16 +261,23 @@ class RepositoryManager:
     async def list_repositories(self) -> str:
         """List all repositories in the workspace."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                repos_path = f"{self.workspace_path}/repositories"
-                stdin, stdout, stderr = ssh.exec_command(f"ls -la {repos_path}")
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code == 0:
-                    output = stdout.read().decode('utf-8', errors='replace')
-                    return f"Repositories in {repos_path}:\n{output}"
-                else:
-                    return f"No repositories found in {repos_path}"
+            repos_path = f"{self.workspace_path}/repositories"
+            
+            cached = self._repo_list_cache.get(repos_path)
+            if cached and time.monotonic() - cached[0] < self.repo_list_ttl:
+                names = cached[1]
+            else:
+                # One name per line; no per-entry stat like 'ls -la'
+                _, listing, _ = await self._exec(
+                    f"ls -1 --color=never {shlex.quote(repos_path)} 2>/dev/null || true"
+                )
+                names = sorted(listing.splitlines())
+                self._repo_list_cache[repos_path] = (time.monotonic(), names)
+            
+            if names:
+                return f"Repositories in {repos_path}:\n{json.dumps(names)}"
+            else:
+                return f"No repositories found in {repos_path}"
                     
         except Exception as e:
             raise Exception(f"Failed to list repositories: {str(e)}")
@@ -104,22 +287,34 @@ class RepositoryManager:
         try:
             repo_path = f"{self.workspace_path}/repositories/{repo_name}"
             
-            with self.ssh_pool.get_connection() as ssh:
-                # Check if repository exists
-                stdin, stdout, stderr = ssh.exec_command(f"test -d {repo_path} && echo 'exists'")
-                if stdout.read().decode().strip() != 'exists':
-                    raise Exception(f"Repository '{repo_name}' not found")
+            # Repositories already validated this session need no SSH round trip
+            if repo_name not in self._validated_repos:
+                # Check existence and git metadata in a single probe, and
+                # capture 'git status' in the same exec since it usually follows.
+                # .git is a file rather than a directory in worktrees and submodules.
+                exit_code, output, error = await self._exec(
+                    f"if [ -e {shlex.quote(repo_path + '/.git')} ]; then echo ok; git -C {shlex.quote(repo_path)} status; "
+                    f"elif [ -d {shlex.quote(repo_path)} ]; then echo nogit; fi"
+                )
+                probe, _, status_text = output.partition("\n")
                 
-                # Verify it's a git repository
-                stdin, stdout, stderr = ssh.exec_command(f"cd {repo_path} && git status")
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code == 0:
-                    self.current_repo = repo_name
-                    self.repositories[repo_name] = repo_path
-                    return f"Switched to repository '{repo_name}' at {repo_path}"
-                else:
+                if probe == 'nogit':
                     raise Exception(f"'{repo_name}' is not a valid git repository")
+                if probe != 'ok':
+                    raise Exception(f"Repository '{repo_name}' not found")
+                self._validated_repos.add(repo_name)
+                # A failed 'git status' is not worth replaying to git_status
+                if exit_code == 0:
+                    self._status_snapshot[repo_name] = (time.monotonic(), {
+                        'operation': 'status',
+                        'exit_code': exit_code,
+                        'stdout': _cap_text(status_text),
+                        'stderr': _cap_text(error)
+                    })
+            
+            self.current_repo = repo_name
+            self.repositories[repo_name] = repo_path
+            return f"Switched to repository '{repo_name}' at {repo_path}"
                     
         except Exception as e:
             raise Exception(f"Failed to switch repository: {str(e)}")
@@ -131,116 +326,811 @@ class RepositoryManager:
         else:
             return "No repository currently selected"
     
-    async def git_operation(self, operation: str, **params) -> str:
-        """Execute git operations in the current repository context."""
+    @staticmethod
+    def _format_git_command(repo_path: str, operation: str, params: Dict[str, Any]) -> str:
+        """Build a single git command line from an operation and its parameters.
+        
+        Uses 'git -C' rather than a 'cd', and quotes each value as one argument.
+        Parameters are appended as 'key value', except 'args', whose entries
+        (a list, or a space-separated string) follow as positional arguments.
+        The operation must look like a git subcommand and every other key
+        like an option ('-n', '--author'); anything else is rejected.
+        """
+        if not _GIT_OPERATION_RE.match(operation):
+            raise SecurityError(f"Invalid git operation '{operation}'")
+        git_cmd = f"git -C {shlex.quote(repo_path)} {operation}"
+        for key, value in params.items():
+            if key == 'args':
+                continue
+            if not _GIT_OPTION_RE.match(key):
+                raise SecurityError(f"Invalid git option '{key}' for '{operation}'")
+            if value is not None:
+                git_cmd += f" {key} {shlex.quote(str(value))}"
+        args = params.get('args') or []
+        if isinstance(args, str):
+            args = shlex.split(args)
+        for arg in args:
+            git_cmd += f" {shlex.quote(str(arg))}"
+        return git_cmd
+    
+    async def git_pipeline(self, operations: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Execute several git operations in the current repository through one SSH exec.
+        
+        Steps are chained with '&&', so the pipeline stops at the first failing
+        step. Returns the overall exit code and one entry per step with its
+        exit code and output; steps that never ran have an exit code of None.
+        """
         if not self.current_repo:
             raise Exception("No repository selected. Use switch_repository first.")
         
         repo_path = self.repositories[self.current_repo]
+        # Any git command may change what 'git status' reports
+        self._status_snapshot.pop(self.current_repo, None)
+        
+        # Each step prints a marker on both streams so output can be split per step
+        marker = _GIT_STEP_MARKER
+        steps = [
+            f"{{ echo {marker}; echo {marker} >&2; {self._format_git_command(repo_path, op, params)}; }}"
+            for op, params in operations
+        ]
+        pipeline_cmd = " && ".join(steps)
         
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                # Build git command
-                git_cmd = f"cd {repo_path} && git {operation}"
-                
-                # Add parameters
-                for key, value in params.items():
-                    if value is not None:
-                        git_cmd += f" {key} {value}"
-                
-                stdin, stdout, stderr = ssh.exec_command(git_cmd)
-                exit_code = stdout.channel.recv_exit_status()
-                
-                stdout_text = stdout.read().decode('utf-8', errors='replace')
-                stderr_text = stderr.read().decode('utf-8', errors='replace')
-                
-                result = f"Git {operation} in {self.current_repo} (exit code: {exit_code})\n"
-                if stdout_text:
-                    result += f"STDOUT:\n{stdout_text}"
-                if stderr_text:
-                    result += f"STDERR:\n{stderr_text}"
-                
-                return result
-                
+            # One output cap per step; each step is capped again once split
+            exit_code, stdout_text, stderr_text = await self._exec(
+                pipeline_cmd, limit=_MAX_OUTPUT_BYTES * len(operations)
+            )
         except Exception as e:
             raise Exception(f"Git operation failed: {str(e)}")
+        
+        # Text before the first marker comes from the login shell, not a step
+        stdout_parts = stdout_text.split(marker + "\n")[1:]
+        stderr_parts = stderr_text.split(marker + "\n")[1:]
+        ran = len(stdout_parts)
+        
+        results = []
+        for i, (op, _) in enumerate(operations):
+            if i < ran:
+                step_exit = exit_code if i == ran - 1 else 0
+                results.append({
+                    'operation': op,
+                    'exit_code': step_exit,
+                    'stdout': _cap_text(stdout_parts[i]),
+                    'stderr': _cap_text(stderr_parts[i]) if i < len(stderr_parts) else ""
+                })
+            else:
+                results.append({'operation': op, 'exit_code': None, 'stdout': "", 'stderr': ""})
+        
+        if ran == 0 and results:
+            # The pipeline failed before any step started
+            results[0]['exit_code'] = exit_code
+            results[0]['stderr'] = _cap_text(stderr_text)
+        
+        return {'exit_code': exit_code, 'steps': results}
+    
+    async def git_operation(self, operation: str, *args: str, **params) -> str:
+        """Execute git operations in the current repository context.
+        
+        Positional args (paths, commits) follow the 'key value' params.
+        """
+        if args:
+            params['args'] = list(args)
+        pipeline = await self.git_pipeline([(operation, params)])
+        return self._format_git_step(pipeline['steps'][0])
+    
+    async def git_status(self) -> str:
+        """Run 'git status', reusing the snapshot taken by a recent switch."""
+        snapshot = self._status_snapshot.get(self.current_repo)
+        if snapshot and time.monotonic() - snapshot[0] < self.status_snapshot_ttl:
+            return self._format_git_step(snapshot[1])
+        return await self.git_operation("status")
+    
+    def _format_git_step(self, step: Dict[str, Any]) -> str:
+        """Format one git step result for display."""
+        operation = step['operation']
+        stdout_text = step['stdout']
+        stderr_text = step['stderr']
+        
+        parts = [f"Git {operation} in {self.current_repo} (exit code: {step['exit_code']})"]
+        if stdout_text:
+            parts.append(f"STDOUT:\n{stdout_text}")
+        if stderr_text:
+            parts.append(f"STDERR:\n{stderr_text}")
+        
+        return "\n".join(parts)
+
+
+class _TokenReader:
+    """Collects one output stream of a PersistentShell command up to its end token.
+    
+    Only the bytes that could still be the start of a split token are held
+    back between chunks, so each chunk is searched once and output beyond
+    limit is discarded as it arrives.
+    """
+    
+    def __init__(self, token: bytes, limit: Optional[int] = None):
+        self.token = token
+        self.limit = limit
+        self.kept = bytearray()
+        self.cut = False
+        self.done = False
+        self.rest = b""  # Bytes after the token
+        self._pending = b""
+    
+    def feed(self, chunk: bytes) -> None:
+        if self.done:
+            self.rest += chunk
+            return
+        data = self._pending + chunk
+        end = data.find(self.token)
+        if end >= 0:
+            self._keep(data[:end])
+            self.rest = data[end + len(self.token):]
+            self._pending = b""
+            self.done = True
+        else:
+            safe = max(len(data) - len(self.token) + 1, 0)
+            self._keep(data[:safe])
+            self._pending = data[safe:]
+    
+    def _keep(self, data: bytes) -> None:
+        if self.limit is None or len(self.kept) + len(data) <= self.limit:
+            self.kept += data
+        else:
+            self.kept += data[:max(self.limit - len(self.kept), 0)]
+            self.cut = True
+    
+    def result(self) -> bytes:
+        if self.cut:
+            return bytes(self.kept) + ("\n" + _TRUNCATED_MARKER).encode()
+        return bytes(self.kept)
+
+
+class PersistentShell:
+    """A long-lived login shell on one exec channel that runs commands in turn.
+    
+    Reusing the channel saves the channel-open round trip that every
+    exec_command pays. Each command runs in its own subshell with stdin from
+    /dev/null, so 'cd', 'export' or a stray read do not leak into the next
+    command; a per-shell token printed afterwards marks the end of its
+    output and carries the exit code.
+    """
+    
+    def __init__(self, client: paramiko.SSHClient):
+        self.client = client
+        self._token = f"__AI_SHOWMAKER_END_{uuid.uuid4().hex}__".encode()
+        self.channel = client.get_transport().open_session()
+        # Same shell that exec_command would run the command under
+        self.channel.exec_command('exec "${SHELL:-/bin/sh}"')
+    
+    @property
+    def closed(self) -> bool:
+        return self.channel.closed or self.channel.exit_status_ready()
+    
+    def run(self, command: str, timeout: Optional[float] = None,
+            limit: Optional[int] = None) -> Tuple[int, bytes, bytes]:
+        """Run one command and return (exit_code, stdout_bytes, stderr_bytes).
+        
+        timeout bounds the whole command (None waits indefinitely). With a
+        limit, only the first limit bytes of each stream are kept; the rest is
+        still read, to find the end token, and discarded. On timeout or any
+        error the shell is closed, since its state is no longer known; the
+        pool replaces it on next use.
+        """
+        token = self._token.decode()
+        script = (
+            f"( eval {shlex.quote(command)} ) </dev/null; "
+            f"printf '%s%d\\n' {token} $?; printf '%s\\n' {token} >&2\n"
+        )
+        try:
+            self.channel.sendall(script.encode())
+            out, err = _TokenReader(self._token, limit), _TokenReader(self._token, limit)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not (out.done and err.done):
+                # Checked on every pass: a command that never stops writing
+                # is never idle
+                if deadline is not None and time.monotonic() > deadline:
+                    raise socket.timeout(f"Command did not finish within {timeout}s")
+                idle = True
+                if self.channel.recv_ready():
+                    out.feed(self._recv(self.channel.recv))
+                    idle = False
+                if self.channel.recv_stderr_ready():
+                    err.feed(self._recv(self.channel.recv_stderr))
+                    idle = False
+                if idle:
+                    if self.closed:
+                        raise EOFError("Shell channel closed before the command finished")
+                    select.select([self.channel], [], [], 0.5)
+            
+            # The exit code follows the token on its own line
+            while b"\n" not in out.rest:
+                out.rest += self._recv(self.channel.recv)
+            exit_code = int(out.rest.strip() or -1)
+        except BaseException:
+            self.close()
+            raise
+        
+        return exit_code, out.result(), err.result()
+    
+    @staticmethod
+    def _recv(recv) -> bytes:
+        chunk = recv(32768)
+        if not chunk:
+            raise EOFError("Shell channel closed before the command finished")
+        return chunk
+    
+    def close(self) -> None:
+        try:
+            self.channel.close()
+        except Exception:
+            pass
 
 
 class SSHConnectionPool:
-    """Thread-safe SSH connection pool for reusing connections."""
+    """Thread-safe pool of up to max_connections SSH clients.
     
-    def __init__(self, max_connections: int = 5, connection_timeout: int = 300):
+    Idle clients are kept in a LIFO queue so the most recently used (and
+    most likely still warm) client is handed out first. Each checked-out
+    client is used by exactly one caller at a time.
+    """
+    
+    def __init__(self, max_connections: int = 5, connection_timeout: int = 300,
+                 reap_interval: int = 30, min_connections: int = 2,
+                 keepalive_interval: int = 30, acquire_timeout: int = 60,
+                 window_size: int = 8 * 1024 * 1024, max_packet_size: int = 32768,
+                 sftp_window_size: Optional[int] = None):
         self.max_connections = max_connections
+        self.min_connections = min_connections
         self.connection_timeout = connection_timeout
+        self.reap_interval = reap_interval
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+        # Receive window and packet size for channels on pooled transports
+        # (paramiko defaults: 2 MiB / 32 KiB); SFTP may use its own window
+        self.window_size = window_size
+        self.max_packet_size = max_packet_size
+        self.sftp_window_size = sftp_window_size or window_size
+        # Every live pool entry (idle or checked out), keyed by id(client)
         self.connections = {}
         self.lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        # Connection settings, cached by refresh_env()
+        self._host = None
+        self._user = None
+        self._pkey = None
+        # Remote directories known to exist, so writes can skip mkdir
+        self._known_dirs = set()
+        
+        # Idle/dead clients are evicted in the background so the hot path
+        # does not have to probe the transport on every call
+        self._reaper_thread = threading.Thread(
+            target=self._reaper, name="ssh-pool-reaper", daemon=True
+        )
+        self._reaper_thread.start()
+    
+    def refresh_env(self) -> None:
+        """(Re)load host, user and the parsed private key from the environment."""
+        self._host = os.environ["AWS_HOST"]
+        self._user = os.environ["AWS_USER"]
+        self._pkey = paramiko.Ed25519Key.from_private_key_file(os.environ["AWS_KEY_PATH"])
     
     def _create_connection(self) -> paramiko.SSHClient:
         """Create a new SSH connection."""
-        key = paramiko.Ed25519Key.from_private_key_file(os.environ["AWS_KEY_PATH"])
+        # Settings are loaded on first connect, since the pool is built before
+        # the environment is known (e.g. during tool discovery)
+        if self._pkey is None:
+            self.refresh_env()
         ssh = paramiko.SSHClient()
         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         ssh.connect(
-            hostname=os.environ["AWS_HOST"],
-            username=os.environ["AWS_USER"],
-            pkey=key,
-            timeout=30
+            hostname=self._host,
+            username=self._user,
+            pkey=self._pkey,
+            timeout=30,
+            # Agent traffic is mostly source code and command output
+            compress=True
         )
+        transport = ssh.get_transport()
+        # Keep idle connections alive through NAT/load-balancer timeouts
+        transport.set_keepalive(self.keepalive_interval)
+        # A larger window lets big command output stream without the remote
+        # side waiting on window adjusts; applies to channels opened later
+        transport.default_window_size = self.window_size
+        transport.default_max_packet_size = self.max_packet_size
         return ssh
     
-    @contextmanager
-    def get_connection(self):
-        """Get a connection from the pool (context manager)."""
-        connection_key = f"{os.environ['AWS_HOST']}:{os.environ['AWS_USER']}"
+    def _new_entry(self) -> Dict[str, Any]:
+        """Connect a new client and add it to the pool (caller reserved a slot)."""
+        try:
+            client = self._create_connection()
+        except Exception:
+            with self.lock:
+                self._created -= 1
+            raise
         
+        conn_info = {'client': client, 'sftp': None, 'shell': None, 'last_used': time.monotonic()}
         with self.lock:
-            if connection_key not in self.connections:
-                self.connections[connection_key] = {
-                    'client': self._create_connection(),
-                    'last_used': time.time(),
-                    'in_use': False
-                }
+            self.connections[id(client)] = conn_info
+        return conn_info
+    
+    def _discard(self, conn_info: Dict[str, Any]) -> None:
+        """Remove an entry from the pool and close its client."""
+        with self.lock:
+            if self.connections.pop(id(conn_info['client']), None) is not None:
+                self._created -= 1
+        try:
+            conn_info['client'].close()
+        except Exception:
+            pass
+    
+    def _reaper(self) -> None:
+        """Periodically evict idle or dead connections."""
+        while True:
+            time.sleep(self.reap_interval)
+            try:
+                self.reap()
+            except Exception:
+                pass
+    
+    def reap(self) -> int:
+        """Close idle clients that timed out or whose transport is no longer active.
         
-        conn_info = self.connections[connection_key]
+        Timed-out clients are only closed while more than min_connections
+        remain, so a prewarmed pool stays warm.
+        """
+        now = time.monotonic()
+        with self.lock:
+            created = self._created
         
-        # Check if connection is still alive
-        try:
-            transport = conn_info['client'].get_transport()
-            if not transport or not transport.is_active():
-                conn_info['client'] = self._create_connection()
-        except:
-            conn_info['client'] = self._create_connection()
+        # Inspect the idle entries in place and take out only the stale ones,
+        # so a concurrent checkout still finds the healthy clients. Oldest
+        # entries sit at the front of the LIFO queue's list.
+        stale = []
+        with self._idle.mutex:
+            for conn_info in list(self._idle.queue):
+                transport = conn_info['client'].get_transport()
+                if not transport or not transport.is_active():
+                    stale.append(conn_info)
+                elif now - conn_info['last_used'] > self.connection_timeout and \
+                        created - len(stale) > self.min_connections:
+                    stale.append(conn_info)
+            for conn_info in stale:
+                self._idle.queue.remove(conn_info)
         
-        conn_info['in_use'] = True
-        conn_info['last_used'] = time.time()
+        for conn_info in stale:
+            self._discard(conn_info)
         
+        return len(stale)
+    
+    def prewarm(self) -> int:
+        """Open up to min_connections idle clients ahead of the first tool call."""
+        created = 0
+        while True:
+            with self.lock:
+                if self._created >= min(self.min_connections, self.max_connections):
+                    break
+                self._created += 1
+            # _new_entry gives the reserved slot back if connecting fails
+            conn_info = self._new_entry()
+            self._idle.put(conn_info)
+            created += 1
+        return created
+    
+    def detach_all(self) -> List[paramiko.SSHClient]:
+        """Empty the pool and return every client it held, for the caller to close."""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        with self.lock:
+            clients = [conn_info['client'] for conn_info in self.connections.values()]
+            self.connections.clear()
+            self._created = 0
+        return clients
+    
+    @contextmanager
+    def _checkout(self):
+        """Check out an idle pool entry, connecting a new one below the cap."""
         try:
+            conn_info = self._idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                reserve = self._created < self.max_connections
+                if reserve:
+                    self._created += 1
+            if reserve:
+                # Connect without holding the lock so a slow handshake does not
+                # block callers returning or taking other clients
+                conn_info = self._new_entry()
+            else:
+                try:
+                    conn_info = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise ConnectionError(
+                        self._host or "unknown",
+                        f"No SSH connection available after {self.acquire_timeout}s"
+                    )
+        
+        try:
+            yield conn_info
+        except (paramiko.SSHException, EOFError):
+            # The reaper only catches dead transports between calls; a
+            # failure mid-call drops the client for a lazy reconnect
+            self._discard(conn_info)
+            raise
+        except BaseException:
+            self._release(conn_info)
+            raise
+        else:
+            self._release(conn_info)
+    
+    def _release(self, conn_info: Dict[str, Any]) -> None:
+        """Return a client to the idle queue, or drop it if its transport died."""
+        transport = conn_info['client'].get_transport()
+        if transport is None or not transport.is_active():
+            self._discard(conn_info)
+            return
+        # Only idle time matters to the reaper, so stamp on release
+        conn_info['last_used'] = time.monotonic()
+        self._idle.put(conn_info)
+    
+    @contextmanager
+    def get_connection(self):
+        """Get a connection from the pool (context manager)."""
+        with self._checkout() as conn_info:
             yield conn_info['client']
-        finally:
-            conn_info['in_use'] = False
+    
+    def _handle(self, conn_info: Dict[str, Any], kind: str):
+        """Return the requested view of a checked-out entry.
+        
+        'client' is the SSHClient, 'sftp' the (client, SFTPClient) pair and
+        'shell' the entry's PersistentShell. The SFTP session and the shell
+        are started on first use and then reused by every later call.
+        """
+        if kind == 'sftp':
+            sftp = conn_info['sftp']
+            if sftp is None or sftp.sock.closed:
+                sftp = conn_info['sftp'] = paramiko.SFTPClient.from_transport(
+                    conn_info['client'].get_transport(),
+                    window_size=self.sftp_window_size,
+                    max_packet_size=self.max_packet_size
+                )
+            return conn_info['client'], sftp
+        if kind == 'shell':
+            shell = conn_info['shell']
+            if shell is None or shell.closed:
+                shell = conn_info['shell'] = PersistentShell(conn_info['client'])
+            return shell
+        return conn_info['client']
+    
+    @contextmanager
+    def get_shell(self):
+        """Get the persistent shell of a pooled connection, starting it if needed."""
+        with self._checkout() as conn_info:
+            yield self._handle(conn_info, 'shell')
+    
+    def run(self, func, handle: str = 'client'):
+        """Call func on a pooled connection, reconnecting once if it went stale.
+        
+        func receives the view of the connection named by handle (see
+        _handle). Clients are not health-checked on checkout; keepalives mark
+        a dropped transport inactive in the background. If func fails and
+        the transport turns out to be dead, func is retried once on another
+        (possibly new) connection.
+        """
+        with self._checkout() as conn_info:
+            try:
+                return func(self._handle(conn_info, handle))
+            except (paramiko.SSHException, EOFError):
+                transport = conn_info['client'].get_transport()
+                if transport is not None and transport.is_active():
+                    raise
+        with self._checkout() as conn_info:
+            return func(self._handle(conn_info, handle))
+
+
+# Path traversal (`..`), POSIX absolute paths and Windows drive paths
+_BAD_PATH_RE = re.compile(r'\.\.|^/|^[A-Za-z]:[\\/]')
+
+# Extension of the last path component, with Path.suffix semantics:
+# leading-dot names (".env") and trailing dots ("file.") have no suffix,
+# trailing separators ("dir.d/") are ignored
+_SUFFIX_RE = re.compile(r'[^/\\](\.[^./\\]+)(?:[/\\]\.?)*$')
 
+# File extensions that may be written to the remote server
+_ALLOWED_EXT = frozenset({'.py', '.txt', '.js', '.html', '.css', '.json', '.md', '.yml', '.yaml', '.sh', '.conf'})
+_ALLOWED_EXT_STR = repr(sorted(_ALLOWED_EXT))
 
+
+# Agents rewrite the same files repeatedly; accepted names are remembered
+# (rejected ones raise and are re-checked every time)
+@functools.lru_cache(maxsize=1024)
 def validate_filename(filename: str) -> str:
     """Validate filename to prevent path traversal attacks."""
-    # Convert to Path object for better handling
-    path = Path(filename)
-    
-    # Check for path traversal attempts
-    if '..' in filename or filename.startswith('/'):
-        raise SecurityError(f"Path traversal detected in '{filename}'")
-    
-    # Check for absolute paths on Windows
-    if path.is_absolute():
+    # Check for path traversal and absolute paths in a single scan
+    match = _BAD_PATH_RE.search(filename)
+    if match:
+        if match.group() in ('..', '/'):
+            raise SecurityError(f"Path traversal detected in '{filename}'")
         raise SecurityError(f"Absolute paths not allowed '{filename}'")
     
     # Restrict to reasonable file extensions
-    allowed_extensions = {'.py', '.txt', '.js', '.html', '.css', '.json', '.md', '.yml', '.yaml', '.sh', '.conf'}
-    if path.suffix and path.suffix.lower() not in allowed_extensions:
-        raise SecurityError(f"File extension '{path.suffix}' not allowed. Allowed: {sorted(allowed_extensions)}")
+    match = _SUFFIX_RE.search(filename)
+    if match and match.group(1).lower() not in _ALLOWED_EXT:
+        raise SecurityError(f"File extension '{match.group(1)}' not allowed. Allowed: {_ALLOWED_EXT_STR}")
     
     return filename
 
 
+# Parameter schemas for the registered tools, built once at import
+_SCHEMA_NO_ARGS = {"type": "object", "properties": {}}
+
+_SCHEMA_CLONE_REPOSITORY = {
+    "type": "object",
+    "properties": {
+        "repo_url": {
+            "type": "string",
+            "description": "Repository URL (HTTPS or SSH)"
+        },
+        "repo_name": {
+            "type": "string",
+            "description": "Name for the repository in the workspace"
+        },
+        "auth_token": {
+            "type": "string",
+            "description": "Authentication token (optional)",
+            "default": None
+        }
+    },
+    "required": ["repo_url", "repo_name"]
+}
+
+_SCHEMA_SWITCH_REPOSITORY = {
+    "type": "object",
+    "properties": {
+        "repo_name": {
+            "type": "string",
+            "description": "Name of the repository to switch to"
+        }
+    },
+    "required": ["repo_name"]
+}
+
+_SCHEMA_GIT_LOG = {
+    "type": "object",
+    "properties": {
+        "n": {
+            "type": "integer",
+            "description": "Number of commits to show",
+            "default": 10
+        }
+    }
+}
+
+_SCHEMA_GIT_DIFF = {
+    "type": "object",
+    "properties": {
+        "commit1": {
+            "type": "string",
+            "description": "First commit hash (optional)",
+            "default": None
+        },
+        "commit2": {
+            "type": "string",
+            "description": "Second commit hash (optional)",
+            "default": None
+        }
+    }
+}
+
+_SCHEMA_GIT_ADD = {
+    "type": "object",
+    "properties": {
+        "files": {
+            "type": "string",
+            "description": "Files to add (use '.' for all files)",
+            "default": "."
+        }
+    },
+    "required": ["files"]
+}
+
+_SCHEMA_GIT_COMMIT = {
+    "type": "object",
+    "properties": {
+        "message": {
+            "type": "string",
+            "description": "Commit message"
+        }
+    },
+    "required": ["message"]
+}
+
+_SCHEMA_GIT_PUSH = {
+    "type": "object",
+    "properties": {
+        "branch": {
+            "type": "string",
+            "description": "Branch to push",
+            "default": "main"
+        }
+    }
+}
+
+_SCHEMA_GIT_PULL = {
+    "type": "object",
+    "properties": {
+        "branch": {
+            "type": "string",
+            "description": "Branch to pull",
+            "default": "main"
+        }
+    }
+}
+
+_SCHEMA_GIT_PIPELINE = {
+    "type": "object",
+    "properties": {
+        "steps": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "operation": {"type": "string"},
+                    "params": {"type": "object"}
+                },
+                "required": ["operation"]
+            },
+            "description": "Git operations (subcommands such as 'status' or 'log') to run in order, each with optional 'params' of option names ('-n', '--author') appended as 'key value'; a 'params.args' list (or space-separated string) is appended as positional arguments such as paths or commits"
+        }
+    },
+    "required": ["steps"]
+}
+
+_SCHEMA_PULL_MODEL = {
+    "type": "object",
+    "properties": {
+        "model_name": {
+            "type": "string",
+            "description": "Model name like 'qwen2.5:7b', 'llama3.1:8b', 'mistral:7b'"
+        }
+    },
+    "required": ["model_name"]
+}
+
+_SCHEMA_TEST_LOCAL_MODEL = {
+    "type": "object",
+    "properties": {
+        "model_name": {
+            "type": "string",
+            "description": "Model name to test"
+        },
+        "prompt": {
+            "type": "string",
+            "description": "Test prompt to send to the model"
+        }
+    },
+    "required": ["model_name", "prompt"]
+}
+
+_SCHEMA_EXECUTE_COMMAND = {
+    "type": "object",
+    "properties": {
+        "command": {
+            "type": "string",
+            "description": "Shell command like 'ls', 'cat file.txt', 'python script.py'"
+        },
+        "input_data": {
+            "type": "string",
+            "description": "Input for interactive commands (optional)",
+            "default": ""
+        }
+    },
+    "required": ["command"]
+}
+
+_SCHEMA_WRITE_FILE = {
+    "type": "object",
+    "properties": {
+        "filename": {
+            "type": "string",
+            "description": "Filename like 'script.py', 'data.txt', 'config.json'"
+        },
+        "content": {
+            "type": "string",
+            "description": "File content as a string"
+        }
+    },
+    "required": ["filename", "content"]
+}
+
+_SCHEMA_WRITE_FILES = {
+    "type": "object",
+    "properties": {
+        "files": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "filename": {"type": "string"},
+                    "content": {"type": "string"}
+                },
+                "required": ["filename", "content"]
+            },
+            "description": "Files to write, each with 'filename' and 'content'"
+        }
+    },
+    "required": ["files"]
+}
+
+_SCHEMA_READ_FILE = {
+    "type": "object",
+    "properties": {
+        "filename": {
+            "type": "string",
+            "description": "Filename to read like 'script.py', 'data.txt'"
+        }
+    },
+    "required": ["filename"]
+}
+
+_SCHEMA_LIST_DIRECTORY = {
+    "type": "object", 
+    "properties": {
+        "path": {
+            "type": "string",
+            "description": "Directory path like '/home/user' or 'subdir' (optional, defaults to current)",
+            "default": "."
+        }
+    }
+}
+
+_SCHEMA_EXECUTE_COMMANDS_SESSION = {
+    "type": "object",
+    "properties": {
+        "commands": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "List of commands to execute in sequence"
+        },
+        "working_directory": {
+            "type": "string",
+            "description": "Working directory to start in (optional)",
+            "default": None
+        }
+    },
+    "required": ["commands"]
+}
+
+_SCHEMA_EXECUTE_COMMANDS_PARALLEL = {
+    "type": "object",
+    "properties": {
+        "commands": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Independent commands to run at the same time"
+        }
+    },
+    "required": ["commands"]
+}
+
+_SCHEMA_DEVELOPMENT_WORKFLOW = {
+    "type": "object",
+    "properties": {
+        "workflow_type": {
+            "type": "string",
+            "description": "Type of workflow: 'web_app', 'python_app', or 'system_check'",
+            "enum": ["web_app", "python_app", "system_check"],
+            "default": "web_app"
+        }
+    }
+}
+
+
 class RemoteMCPServer(AIShowmakerMCPServer):
     """MCP Server for remote server operations via SSH/SFTP with repository management."""
     
@@ -252,6 +1142,11 @@ class RemoteMCPServer(AIShowmakerMCPServer):
         )
         self.ssh_pool = SSHConnectionPool()
         self.repo_manager = RepositoryManager(self.ssh_pool)
+        # Ollama was last confirmed running until this monotonic time
+        self.ollama_check_ttl = 60.0
+        # Time a shell command may run; matches the execute_command tool timeout
+        self.command_timeout = 60.0
+        self._ollama_ok_until = 0.0
     
     async def initialize(self) -> None:
         """Initialize the remote server and register tools."""
@@ -259,413 +1154,251 @@ class RemoteMCPServer(AIShowmakerMCPServer):
         # Don't initialize workspace during discovery - do it lazily when tools are used
         # await self.repo_manager.initialize_workspace()
         
-        # Register repository management tools
-        init_workspace_tool = MCPTool(
-            name="init_workspace",
-            description="Initialize the remote workspace for repository management",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._init_workspace,
-            category="repository",
-            timeout=30
-        )
-        self.register_tool(init_workspace_tool)
-        
-        clone_repo_tool = MCPTool(
-            name="clone_repository",
-            description="Clone a repository to the remote workspace. Call as: clone_repository(repo_url='https://github.com/user/repo.git', repo_name='my-repo', auth_token='optional_token')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "repo_url": {
-                        "type": "string",
-                        "description": "Repository URL (HTTPS or SSH)"
-                    },
-                    "repo_name": {
-                        "type": "string",
-                        "description": "Name for the repository in the workspace"
-                    },
-                    "auth_token": {
-                        "type": "string",
-                        "description": "Authentication token (optional)",
-                        "default": None
-                    }
-                },
-                "required": ["repo_url", "repo_name"]
-            },
-            execute_func=self._clone_repository,
-            category="repository",
-            timeout=120
-        )
-        self.register_tool(clone_repo_tool)
-        
-        list_repos_tool = MCPTool(
-            name="list_repositories",
-            description="List all repositories in the remote workspace",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._list_repositories,
-            category="repository",
-            timeout=15
-        )
-        self.register_tool(list_repos_tool)
-        
-        switch_repo_tool = MCPTool(
-            name="switch_repository",
-            description="Switch to a specific repository context. Call as: switch_repository(repo_name='my-repo')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "repo_name": {
-                        "type": "string",
-                        "description": "Name of the repository to switch to"
-                    }
-                },
-                "required": ["repo_name"]
-            },
-            execute_func=self._switch_repository,
-            category="repository",
-            timeout=15
-        )
-        self.register_tool(switch_repo_tool)
-        
-        current_repo_tool = MCPTool(
-            name="get_current_repository",
-            description="Get the current repository context",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._get_current_repository,
-            category="repository",
-            timeout=5
-        )
-        self.register_tool(current_repo_tool)
-        
-        # Register git operation tools
-        git_status_tool = MCPTool(
-            name="git_status",
-            description="Get git status of the current repository",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._git_status,
-            category="git",
-            timeout=15
-        )
-        self.register_tool(git_status_tool)
-        
-        git_log_tool = MCPTool(
-            name="git_log",
-            description="Get git log of the current repository. Call as: git_log(n=10) for last 10 commits",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "n": {
-                        "type": "integer",
-                        "description": "Number of commits to show",
-                        "default": 10
-                    }
-                }
-            },
-            execute_func=self._git_log,
-            category="git",
-            timeout=15
-        )
-        self.register_tool(git_log_tool)
+        # Open pooled SSH connections in the background so the first tool
+        # call does not pay the handshake, without holding up startup and tool
+        # discovery; skipped when no remote host is configured
+        if os.environ.get("AWS_HOST") and os.environ.get("AWS_USER"):
+            # The outcome is logged from the worker thread: the loop that
+            # started it may be blocked or closed by the time it finishes
+            asyncio.get_event_loop().run_in_executor(None, self._prewarm_sync)
         
-        git_diff_tool = MCPTool(
-            name="git_diff",
-            description="Get git diff of the current repository. Call as: git_diff() for working directory changes",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "commit1": {
-                        "type": "string",
-                        "description": "First commit hash (optional)",
-                        "default": None
-                    },
-                    "commit2": {
-                        "type": "string",
-                        "description": "Second commit hash (optional)",
-                        "default": None
-                    }
-                }
-            },
-            execute_func=self._git_diff,
-            category="git",
-            timeout=15
-        )
-        self.register_tool(git_diff_tool)
-        
-        git_add_tool = MCPTool(
-            name="git_add",
-            description="Add files to git staging area. Call as: git_add(files='.') for all files or git_add(files='file1.py file2.py') for specific files",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "files": {
-                        "type": "string",
-                        "description": "Files to add (use '.' for all files)",
-                        "default": "."
-                    }
-                },
-                "required": ["files"]
-            },
-            execute_func=self._git_add,
-            category="git",
-            timeout=30
-        )
-        self.register_tool(git_add_tool)
-        
-        git_commit_tool = MCPTool(
-            name="git_commit",
-            description="Commit changes to git. Call as: git_commit(message='Add new feature')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "Commit message"
-                    }
-                },
-                "required": ["message"]
-            },
-            execute_func=self._git_commit,
-            category="git",
-            timeout=30
-        )
-        self.register_tool(git_commit_tool)
-        
-        git_push_tool = MCPTool(
-            name="git_push",
-            description="Push changes to remote repository. Call as: git_push(branch='main')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch to push",
-                        "default": "main"
-                    }
-                }
-            },
-            execute_func=self._git_push,
-            category="git",
-            timeout=60
-        )
-        self.register_tool(git_push_tool)
-        
-        git_pull_tool = MCPTool(
-            name="git_pull",
-            description="Pull changes from remote repository. Call as: git_pull(branch='main')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch to pull",
-                        "default": "main"
-                    }
-                }
-            },
-            execute_func=self._git_pull,
-            category="git",
-            timeout=60
-        )
-        self.register_tool(git_pull_tool)
-        
-        # Register Ollama/Local Model tools
-        install_ollama_tool = MCPTool(
-            name="install_ollama",
-            description="Install Ollama on the remote server for local model support",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._install_ollama,
-            category="local_models",
-            timeout=300
-        )
-        self.register_tool(install_ollama_tool)
-        
-        pull_model_tool = MCPTool(
-            name="pull_model",
-            description="Pull a model to Ollama. Call as: pull_model(model_name='qwen2.5:7b')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "model_name": {
-                        "type": "string",
-                        "description": "Model name like 'qwen2.5:7b', 'llama3.1:8b', 'mistral:7b'"
-                    }
-                },
-                "required": ["model_name"]
-            },
-            execute_func=self._pull_model,
-            category="local_models",
-            timeout=600
-        )
-        self.register_tool(pull_model_tool)
-        
-        list_models_tool = MCPTool(
-            name="list_ollama_models",
-            description="List all available Ollama models on the remote server",
-            parameters={"type": "object", "properties": {}},
-            execute_func=self._list_ollama_models,
-            category="local_models",
-            timeout=15
-        )
-        self.register_tool(list_models_tool)
-        
-        test_local_model_tool = MCPTool(
-            name="test_local_model",
-            description="Test a local model with a prompt. Call as: test_local_model(model_name='qwen2.5:7b', prompt='Hello, how are you?')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "model_name": {
-                        "type": "string",
-                        "description": "Model name to test"
-                    },
-                    "prompt": {
-                        "type": "string",
-                        "description": "Test prompt to send to the model"
-                    }
-                },
-                "required": ["model_name", "prompt"]
-            },
-            execute_func=self._test_local_model,
-            category="local_models",
-            timeout=120
-        )
-        self.register_tool(test_local_model_tool)
-        
-        # Register existing command execution tool
-        execute_command_tool = MCPTool(
-            name="execute_command",
-            description="Execute a single command on the remote server. MUST use key 'command' (string). For multiple commands, use 'execute_commands_session' with 'commands': ['...']. Example: PARAMETERS: {\"command\": \"ls -la\"}",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Shell command like 'ls', 'cat file.txt', 'python script.py'"
-                    },
-                    "input_data": {
-                        "type": "string",
-                        "description": "Input for interactive commands (optional)",
-                        "default": ""
-                    }
-                },
-                "required": ["command"]
-            },
-            execute_func=self._execute_command,
-            category="execution",
-            timeout=60
-        )
-        self.register_tool(execute_command_tool)
-        
-        # Register file writing tool
-        write_file_tool = MCPTool(
-            name="write_file", 
-            description="Write a file under the workspace/repository. MUST use key 'filename' (not 'path'/'file_path'). Required: 'filename', 'content'. Example: PARAMETERS: {\"filename\":\"index.html\",\"content\":\"<html>...</html>\"}",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "filename": {
-                        "type": "string",
-                        "description": "Filename like 'script.py', 'data.txt', 'config.json'"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "File content as a string"
-                    }
-                },
-                "required": ["filename", "content"]
-            },
-            execute_func=self._write_file,
-            category="files",
-            timeout=30
-        )
-        self.register_tool(write_file_tool)
-        
-        # Register file reading tool
-        read_file_tool = MCPTool(
-            name="read_file",
-            description="Read a file under the workspace/repository. MUST use key 'filename' (not 'path'/'file_path'). Example: PARAMETERS: {\"filename\":\"index.html\"}", 
-            parameters={
-                "type": "object",
-                "properties": {
-                    "filename": {
-                        "type": "string",
-                        "description": "Filename to read like 'script.py', 'data.txt'"
-                    }
-                },
-                "required": ["filename"]
-            },
-            execute_func=self._read_file,
-            category="files",
-            timeout=30
-        )
-        self.register_tool(read_file_tool)
-        
-        # Register directory listing tool
-        list_directory_tool = MCPTool(
-            name="list_directory",
-            description="List directory contents. Optional key: 'path' (string). Example: PARAMETERS: {\"path\":\"/home/ec2-user/workspace\"}",
-            parameters={
-                "type": "object", 
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Directory path like '/home/user' or 'subdir' (optional, defaults to current)",
-                        "default": "."
-                    }
-                }
-            },
-            execute_func=self._list_directory,
-            category="files",
-            timeout=15
-        )
-        self.register_tool(list_directory_tool)
-        
-        # Register session-based command execution tool
-        execute_commands_session_tool = MCPTool(
-            name="execute_commands_session",
-            description="Execute multiple commands in the SAME SSH session (stateful). MUST use key 'commands': ['...']. Optional 'working_directory'. Example: PARAMETERS: {\"commands\":[\"pwd\",\"ls -la\"],\"working_directory\":\"/home/ec2-user/workspace\"}",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "commands": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of commands to execute in sequence"
-                    },
-                    "working_directory": {
-                        "type": "string",
-                        "description": "Working directory to start in (optional)",
-                        "default": None
-                    }
-                },
-                "required": ["commands"]
-            },
-            execute_func=self._execute_commands_in_session,
-            category="execution",
-            timeout=120
-        )
-        self.register_tool(execute_commands_session_tool)
-        
-        # Register development workflow tool
-        development_workflow_tool = MCPTool(
-            name="development_workflow",
-            description="Execute a complete development workflow in a single SSH session. Call as: development_workflow(workflow_type='web_app') or development_workflow(workflow_type='python_app')",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "workflow_type": {
-                        "type": "string",
-                        "description": "Type of workflow: 'web_app', 'python_app', or 'system_check'",
-                        "enum": ["web_app", "python_app", "system_check"],
-                        "default": "web_app"
-                    }
-                }
-            },
-            execute_func=self._execute_development_workflow,
-            category="development",
-            timeout=180
-        )
-        self.register_tool(development_workflow_tool)
+        tools = [
+            # Repository management tools
+            MCPTool(
+                name="init_workspace",
+                description="Initialize the remote workspace for repository management",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._init_workspace,
+                category="repository",
+                timeout=30
+            ),
+
+            MCPTool(
+                name="clone_repository",
+                description="Clone a repository to the remote workspace. Call as: clone_repository(repo_url='https://github.com/user/repo.git', repo_name='my-repo', auth_token='optional_token')",
+                parameters=_SCHEMA_CLONE_REPOSITORY,
+                execute_func=self._clone_repository,
+                category="repository",
+                timeout=120
+            ),
+
+            MCPTool(
+                name="list_repositories",
+                description="List all repositories in the remote workspace",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._list_repositories,
+                category="repository",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="switch_repository",
+                description="Switch to a specific repository context. Call as: switch_repository(repo_name='my-repo')",
+                parameters=_SCHEMA_SWITCH_REPOSITORY,
+                execute_func=self._switch_repository,
+                category="repository",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="get_current_repository",
+                description="Get the current repository context",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._get_current_repository,
+                category="repository",
+                timeout=5
+            ),
+
+            # Git operation tools
+            MCPTool(
+                name="git_status",
+                description="Get git status of the current repository",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._git_status,
+                category="git",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="git_log",
+                description="Get git log of the current repository. Call as: git_log(n=10) for last 10 commits",
+                parameters=_SCHEMA_GIT_LOG,
+                execute_func=self._git_log,
+                category="git",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="git_diff",
+                description="Get git diff of the current repository. Call as: git_diff() for working directory changes",
+                parameters=_SCHEMA_GIT_DIFF,
+                execute_func=self._git_diff,
+                category="git",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="git_add",
+                description="Add files to git staging area. Call as: git_add(files='.') for all files or git_add(files='file1.py file2.py') for specific files",
+                parameters=_SCHEMA_GIT_ADD,
+                execute_func=self._git_add,
+                category="git",
+                timeout=30
+            ),
+
+            MCPTool(
+                name="git_commit",
+                description="Commit changes to git. Call as: git_commit(message='Add new feature')",
+                parameters=_SCHEMA_GIT_COMMIT,
+                execute_func=self._git_commit,
+                category="git",
+                timeout=30
+            ),
+
+            MCPTool(
+                name="git_push",
+                description="Push changes to remote repository. Call as: git_push(branch='main')",
+                parameters=_SCHEMA_GIT_PUSH,
+                execute_func=self._git_push,
+                category="git",
+                timeout=60
+            ),
+
+            MCPTool(
+                name="git_pull",
+                description="Pull changes from remote repository. Call as: git_pull(branch='main')",
+                parameters=_SCHEMA_GIT_PULL,
+                execute_func=self._git_pull,
+                category="git",
+                timeout=60
+            ),
+
+            MCPTool(
+                name="git_pipeline",
+                description="Run several git operations in one round trip, stopping at the first failure. MUST use key 'steps': a list of {\"operation\", \"params\"} objects. Example: PARAMETERS: {\"steps\":[{\"operation\":\"status\"},{\"operation\":\"pull\",\"params\":{\"origin\":\"main\"}}]}",
+                parameters=_SCHEMA_GIT_PIPELINE,
+                execute_func=self._git_pipeline,
+                category="git",
+                timeout=120
+            ),
+
+            # Ollama/Local Model tools
+            MCPTool(
+                name="install_ollama",
+                description="Install Ollama on the remote server for local model support",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._install_ollama,
+                category="local_models",
+                timeout=300
+            ),
+
+            MCPTool(
+                name="pull_model",
+                description="Pull a model to Ollama. Call as: pull_model(model_name='qwen2.5:7b')",
+                parameters=_SCHEMA_PULL_MODEL,
+                execute_func=self._pull_model,
+                category="local_models",
+                timeout=600
+            ),
+
+            MCPTool(
+                name="list_ollama_models",
+                description="List all available Ollama models on the remote server",
+                parameters=_SCHEMA_NO_ARGS,
+                execute_func=self._list_ollama_models,
+                category="local_models",
+                timeout=15
+            ),
+
+            MCPTool(
+                name="test_local_model",
+                description="Test a local model with a prompt. Call as: test_local_model(model_name='qwen2.5:7b', prompt='Hello, how are you?')",
+                parameters=_SCHEMA_TEST_LOCAL_MODEL,
+                execute_func=self._test_local_model,
+                category="local_models",
+                timeout=120
+            ),
+
+            # Command execution tool
+            MCPTool(
+                name="execute_command",
+                description="Execute a single command on the remote server. MUST use key 'command' (string). For multiple commands, use 'execute_commands_session' with 'commands': ['...']. Example: PARAMETERS: {\"command\": \"ls -la\"}",
+                parameters=_SCHEMA_EXECUTE_COMMAND,
+                execute_func=self._execute_command,
+                category="execution",
+                timeout=60
+            ),
+
+            # File writing tool
+            MCPTool(
+                name="write_file", 
+                description="Write a file under the workspace/repository. MUST use key 'filename' (not 'path'/'file_path'). Required: 'filename', 'content'. Example: PARAMETERS: {\"filename\":\"index.html\",\"content\":\"<html>...</html>\"}",
+                parameters=_SCHEMA_WRITE_FILE,
+                execute_func=self._write_file,
+                category="files",
+                timeout=30
+            ),
+
+            # Batch file writing tool
+            MCPTool(
+                name="write_files",
+                description="Write several files in one call over a single SFTP session. MUST use key 'files': a list of {\"filename\", \"content\"} objects. Example: PARAMETERS: {\"files\":[{\"filename\":\"index.html\",\"content\":\"<html>...</html>\"},{\"filename\":\"style.css\",\"content\":\"body {}\"}]}",
+                parameters=_SCHEMA_WRITE_FILES,
+                execute_func=self._write_files,
+                category="files",
+                timeout=60
+            ),
+
+            # File reading tool
+            MCPTool(
+                name="read_file",
+                description="Read a file under the workspace/repository. MUST use key 'filename' (not 'path'/'file_path'). Example: PARAMETERS: {\"filename\":\"index.html\"}", 
+                parameters=_SCHEMA_READ_FILE,
+                execute_func=self._read_file,
+                category="files",
+                timeout=30
+            ),
+
+            # Directory listing tool
+            MCPTool(
+                name="list_directory",
+                description="List directory contents. Optional key: 'path' (string). Example: PARAMETERS: {\"path\":\"/home/ec2-user/workspace\"}",
+                parameters=_SCHEMA_LIST_DIRECTORY,
+                execute_func=self._list_directory,
+                category="files",
+                timeout=15
+            ),
+
+            # Session-based command execution tool
+            MCPTool(
+                name="execute_commands_session",
+                description="Execute multiple commands in the SAME SSH session (stateful). MUST use key 'commands': ['...']. Optional 'working_directory'. Example: PARAMETERS: {\"commands\":[\"pwd\",\"ls -la\"],\"working_directory\":\"/home/ec2-user/workspace\"}",
+                parameters=_SCHEMA_EXECUTE_COMMANDS_SESSION,
+                execute_func=self._execute_commands_in_session,
+                category="execution",
+                timeout=120
+            ),
+
+            MCPTool(
+                name="execute_commands_parallel",
+                description="Execute several INDEPENDENT commands at the same time, each in its own session (no shared state, no ordering). MUST use key 'commands': ['...']. Example: PARAMETERS: {\"commands\":[\"df -h\",\"free -m\",\"uptime\"]}",
+                parameters=_SCHEMA_EXECUTE_COMMANDS_PARALLEL,
+                execute_func=self._execute_commands_parallel,
+                category="execution",
+                timeout=120
+            ),
+
+            # Development workflow tool
+            MCPTool(
+                name="development_workflow",
+                description="Execute a complete development workflow in a single SSH session. Call as: development_workflow(workflow_type='web_app') or development_workflow(workflow_type='python_app')",
+                parameters=_SCHEMA_DEVELOPMENT_WORKFLOW,
+                execute_func=self._execute_development_workflow,
+                category="development",
+                timeout=180
+            )
+        ]
+        self.register_tools(tools)
         
         self.logger.info(f"Remote MCP Server initialized with {len(self.tools)} tools")
     
@@ -693,43 +1426,65 @@ class RemoteMCPServer(AIShowmakerMCPServer):
     # Git operation methods
     async def _git_status(self) -> str:
         """Get git status of the current repository."""
-        return await self.repo_manager.git_operation("status")
+        return await self.repo_manager.git_status()
     
     async def _git_log(self, n: int = 10) -> str:
         """Get git log of the current repository."""
-        return await self.repo_manager.git_operation("log", n=str(n))
+        return await self.repo_manager.git_operation("log", **{"-n": str(n)})
     
     async def _git_diff(self, commit1: str = None, commit2: str = None) -> str:
         """Get git diff of the current repository."""
         if commit1 and commit2:
-            return await self.repo_manager.git_operation("diff", commit1=commit1, commit2=commit2)
+            return await self.repo_manager.git_operation("diff", commit1, commit2)
         else:
             return await self.repo_manager.git_operation("diff")
     
     async def _git_add(self, files: str) -> str:
         """Add files to git staging area."""
-        return await self.repo_manager.git_operation("add", files=files)
+        return await self.repo_manager.git_operation("add", *shlex.split(files))
     
     async def _git_commit(self, message: str) -> str:
         """Commit changes to git."""
-        return await self.repo_manager.git_operation("commit", m=f'"{message}"')
+        return await self.repo_manager.git_operation("commit", **{"-m": message})
     
     async def _git_push(self, branch: str = "main") -> str:
         """Push changes to remote repository."""
-        return await self.repo_manager.git_operation("push", origin=branch)
+        return await self.repo_manager.git_operation("push", "origin", branch)
     
     async def _git_pull(self, branch: str = "main") -> str:
         """Pull changes from remote repository."""
-        return await self.repo_manager.git_operation("pull", origin=branch)
+        return await self.repo_manager.git_operation("pull", "origin", branch)
+    
+    async def _git_pipeline(self, steps: List[Dict[str, Any]]) -> str:
+        """Run several git operations in one round trip."""
+        pipeline = await self.repo_manager.git_pipeline(
+            [(step['operation'], step.get('params') or {}) for step in steps]
+        )
+        
+        lines = [f"Git pipeline in {self.repo_manager.current_repo} (exit code: {pipeline['exit_code']})"]
+        for step in pipeline['steps']:
+            if step['exit_code'] is None:
+                lines.append(f"--- git {step['operation']} (skipped)")
+                continue
+            lines.append(f"--- git {step['operation']} (exit code: {step['exit_code']})")
+            if step['stdout']:
+                lines.append(f"STDOUT:\n{step['stdout']}")
+            if step['stderr']:
+                lines.append(f"STDERR:\n{step['stderr']}")
+        return "\n".join(lines)
     
     # Ollama/Local Model methods
     async def _install_ollama(self) -> str:
         """Install Ollama on the remote server."""
+        return await self._run_blocking(self._install_ollama_sync)
+    
+    def _install_ollama_sync(self) -> str:
+        """Blocking implementation of _install_ollama."""
         try:
             with self.ssh_pool.get_connection() as ssh:
                 # Check if Ollama is already installed
                 stdin, stdout, stderr = ssh.exec_command("which ollama")
-                exit_code = stdout.channel.recv_exit_status()
+                exit_code, _, _ = _drain_channel(stdout.channel)
                 
                 if exit_code == 0:
                     return "Ollama is already installed on the remote server."
@@ -741,115 +1496,159 @@ class RemoteMCPServer(AIShowmakerMCPServer):
                 pip3 install ollama
                 """
                 stdin, stdout, stderr = ssh.exec_command(install_cmd)
-                exit_code = stdout.channel.recv_exit_status()
+                # apt-get is chatty; drain both streams so it never blocks
+                exit_code, _, error = _drain_channel(stdout.channel, limit=_MAX_OUTPUT_BYTES)
                 
                 if exit_code == 0:
                     return "Ollama installed successfully."
                 else:
-                    error = stderr.read().decode('utf-8', errors='replace')
-                    raise Exception(f"Failed to install Ollama: {error}")
+                    raise Exception(f"Failed to install Ollama: {error.decode('utf-8', errors='replace')}")
         except Exception as e:
             raise Exception(f"Ollama installation failed: {str(e)}")
     
+    def _ensure_ollama_server_sync(self) -> None:
+        """Start a persistent 'ollama serve' on the remote host if it is not running."""
+        with self.ssh_pool.get_connection() as ssh:
+            stdin, stdout, stderr = ssh.exec_command(_OLLAMA_ENSURE_SERVER_CMD)
+            exit_code, _, _ = _drain_channel(stdout.channel)
+        if exit_code != 0:
+            raise Exception("Ollama is not running or not accessible. Please ensure it's installed.")
+    
+    def _ollama_request_sync(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call the remote Ollama HTTP API through an SSH direct-tcpip channel.
+        
+        The request rides on a pooled transport, so no 'ollama' process is
+        spawned per call and no local port has to be forwarded.
+        """
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        request = (
+            f"{method} {path} HTTP/1.0\r\n"
+            f"Host: {_OLLAMA_ADDRESS[0]}:{_OLLAMA_ADDRESS[1]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode('ascii') + body
+        
+        with self.ssh_pool.get_connection() as ssh:
+            channel = ssh.get_transport().open_channel("direct-tcpip", _OLLAMA_ADDRESS, ("127.0.0.1", 0))
+            try:
+                channel.sendall(request)
+                # HTTP/1.0: the server closes the stream after the response
+                response = bytearray()
+                while True:
+                    data = channel.recv(65536)
+                    if not data:
+                        break
+                    response += data
+            finally:
+                channel.close()
+        
+        # Drop the headers in place so the body is never copied before parsing
+        header_end = response.find(b"\r\n\r\n")
+        head = bytes(response[:header_end]) if header_end >= 0 else bytes(response)
+        del response[:header_end + 4 if header_end >= 0 else len(response)]
+        response_body = response
+        status_line = head.split(b"\r\n", 1)[0].decode('ascii', errors='replace')
+        parts = status_line.split(" ", 2)
+        if len(parts) < 2 or parts[1] != "200":
+            raise Exception(f"Ollama API {method} {path} failed: {status_line} {response_body.decode('utf-8', errors='replace')}")
+        return json.loads(response_body) if response_body else {}
+    
+    async def _ollama_request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Ensure the Ollama server is up, then call its HTTP API off the event loop.
+        
+        A successful check is trusted for ollama_check_ttl seconds; if the API
+        cannot be reached within that window the check is redone and the call
+        retried once. HTTP-level errors are raised as-is.
+        """
+        if time.monotonic() < self._ollama_ok_until:
+            try:
+                return await self._run_blocking(self._ollama_request_sync, method, path, payload)
+            except (paramiko.SSHException, EOFError, OSError):
+                self._ollama_ok_until = 0.0
+        
+        await self._run_blocking(self._ensure_ollama_server_sync)
+        self._ollama_ok_until = time.monotonic() + self.ollama_check_ttl
+        return await self._run_blocking(self._ollama_request_sync, method, path, payload)
+    
     async def _pull_model(self, model_name: str) -> str:
         """Pull a model to Ollama."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                # Create a temporary directory for the model
-                model_dir = f"/home/ec2-user/ollama/models/{model_name}"
-                ssh.exec_command(f"mkdir -p {model_dir}")
-                
-                # Pull the model
-                pull_cmd = f"ollama pull {model_name} --model {model_name}"
-                stdin, stdout, stderr = ssh.exec_command(pull_cmd)
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code == 0:
-                    return f"Model '{model_name}' pulled successfully to {model_dir}"
-                else:
-                    error = stderr.read().decode('utf-8', errors='replace')
-                    raise Exception(f"Failed to pull model '{model_name}': {error}")
+            response = await self._ollama_request("POST", "/api/pull", {"name": model_name, "stream": False})
+            return f"Model '{model_name}' pulled successfully ({response.get('status', 'success')})"
         except Exception as e:
             raise Exception(f"Model pulling failed: {str(e)}")
     
     async def _list_ollama_models(self) -> str:
         """List all available Ollama models on the remote server."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                stdin, stdout, stderr = ssh.exec_command("ollama models")
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code == 0:
-                    output = stdout.read().decode('utf-8', errors='replace')
-                    return f"Available Ollama models:\n{output}"
-                else:
-                    error = stderr.read().decode('utf-8', errors='replace')
-                    raise Exception(f"Failed to list Ollama models: {error}")
+            response = await self._ollama_request("GET", "/api/tags")
+            models = response.get('models', [])
+            if not models:
+                return "No Ollama models available"
+            lines = [f"{m.get('name')}\t{m.get('size', 0)} bytes\t{m.get('modified_at', '')}" for m in models]
+            return "Available Ollama models:\n" + "\n".join(lines)
         except Exception as e:
             raise Exception(f"Failed to list Ollama models: {str(e)}")
     
     async def _test_local_model(self, model_name: str, prompt: str) -> str:
         """Test a local model with a prompt."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                # Ensure Ollama is running and accessible
-                stdin, stdout, stderr = ssh.exec_command("ollama models")
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code != 0:
-                    raise Exception("Ollama is not running or not accessible. Please ensure it's installed and running.")
-                
-                # Use printf to handle newlines properly for interactive programs
-                test_cmd = f"printf '{prompt}\\n' | ollama generate --model {model_name}"
-                stdin, stdout, stderr = ssh.exec_command(test_cmd)
-                exit_code = stdout.channel.recv_exit_status()
-                
-                stdout_text = stdout.read().decode('utf-8', errors='replace')
-                stderr_text = stderr.read().decode('utf-8', errors='replace')
-                
-                result = f"Model '{model_name}' test (exit code: {exit_code})\n"
-                if stdout_text:
-                    result += f"STDOUT:\n{stdout_text}"
-                if stderr_text:
-                    result += f"STDERR:\n{stderr_text}"
-                
-                return result
+            response = await self._ollama_request(
+                "POST", "/api/generate", {"model": model_name, "prompt": prompt, "stream": False}
+            )
+            return f"Model '{model_name}' test response:\n{response.get('response', '')}"
         except Exception as e:
             raise Exception(f"Model testing failed: {str(e)}")
     
-    # Existing methods (unchanged)
+    def _prewarm_sync(self) -> None:
+        """Prewarm the SSH pool and log the outcome; runs in the executor."""
+        try:
+            created = self.ssh_pool.prewarm()
+        except Exception as e:
+            self.logger.warning(f"SSH prewarm failed, connecting lazily: {str(e)}")
+        else:
+            self.logger.info(f"Prewarmed {created} SSH connection(s)")
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run blocking paramiko work in the executor so the event loop stays free."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    
+    # Command execution methods
     async def _execute_command(self, command: str, input_data: str = "") -> str:
         """Execute command on remote server with optional input."""
+        return await self._run_blocking(self._execute_command_sync, command, input_data)
+    
+    def _execute_command_sync(self, command: str, input_data: str = "") -> str:
+        """Blocking implementation of _execute_command."""
         try:
-            # Create command with input piping if needed
             if input_data:
-                # Use printf to handle newlines properly for interactive programs
-                piped_command = f"printf '{input_data}\\n' | {command}"
+                # Input goes straight to the command's stdin on a fresh channel,
+                # followed by a newline and EOF for interactive programs
+                def run(ssh):
+                    stdin, stdout, stderr = ssh.exec_command(command, timeout=30)
+                    stdin.channel.sendall((input_data + "\n").encode('utf-8'))
+                    stdin.channel.shutdown_write()
+                    return _drain_channel(stdout.channel, limit=_MAX_OUTPUT_BYTES,
+                                          timeout=self.command_timeout)
+                
+                exit_code, stdout_bytes, stderr_bytes = self.ssh_pool.run(run)
             else:
-                piped_command = command
+                # Plain commands reuse the connection's persistent shell
+                exit_code, stdout_bytes, stderr_bytes = self.ssh_pool.run(
+                    lambda shell: shell.run(command, timeout=self.command_timeout, limit=_MAX_OUTPUT_BYTES),
+                    handle='shell'
+                )
             
-            with self.ssh_pool.get_connection() as ssh:
-                # Execute command with timeout
-                stdin, stdout, stderr = ssh.exec_command(piped_command, timeout=30)
-                
-                # Wait for command completion and get exit code
-                exit_code = stdout.channel.recv_exit_status()
-                
-                # Read output with proper decoding
-                stdout_text = stdout.read().decode('utf-8', errors='replace')
-                stderr_text = stderr.read().decode('utf-8', errors='replace')
-                
-                # Format output with exit code
-                result = f"Exit Code: {exit_code}\\n"
-                if stdout_text:
-                    result += f"STDOUT:\\n{stdout_text}"
-                if stderr_text:
-                    result += f"STDERR:\\n{stderr_text}"
-                if not stdout_text and not stderr_text:
-                    result += "No output"
-                
-                self.logger.info(f"Executed command: {command} (exit code: {exit_code})")
-                return result
+            self.logger.info(f"Executed command: {command} (exit code: {exit_code})")
+            
+            # Format output with exit code in one f-string per case; only
+            # decode non-empty buffers
+            if not stdout_bytes and not stderr_bytes:
+                return f"Exit Code: {exit_code}\\nNo output"
+            stdout_section = f"STDOUT:\\n{stdout_bytes.decode('utf-8', errors='replace')}" if stdout_bytes else ""
+            stderr_section = f"STDERR:\\n{stderr_bytes.decode('utf-8', errors='replace')}" if stderr_bytes else ""
+            return f"Exit Code: {exit_code}\\n{stdout_section}{stderr_section}"
                 
         except paramiko.AuthenticationException:
             raise ConnectionError(os.environ.get("AWS_HOST", "unknown"), "SSH authentication failed")
@@ -858,49 +1657,69 @@ class RemoteMCPServer(AIShowmakerMCPServer):
         except Exception as e:
             raise Exception(f"Command execution failed: {str(e)}")
 
+    async def _execute_commands_parallel(self, commands: List[str]) -> str:
+        """Execute independent commands concurrently, one pooled connection each."""
+        # More in flight than pooled connections would only queue in the pool
+        semaphore = asyncio.Semaphore(self.ssh_pool.max_connections)
+        
+        async def run(command: str) -> str:
+            async with semaphore:
+                try:
+                    return await self._execute_command(command)
+                except Exception as e:
+                    return f"Error: {str(e)}"
+        
+        outputs = await asyncio.gather(*(run(command) for command in commands))
+        return "\n\n".join(f"$ {command}\n{output}" for command, output in zip(commands, outputs))
+    
     async def _execute_commands_in_session(self, commands: List[str], working_directory: str = None) -> str:
         """
         Execute multiple commands in the same SSH session to maintain state.
         This allows commands like 'cd' to persist between subsequent commands.
         """
+        return await self._run_blocking(self._execute_commands_in_session_sync, commands, working_directory)
+    
+    def _execute_commands_in_session_sync(self, commands: List[str], working_directory: str = None) -> str:
+        """Blocking implementation of _execute_commands_in_session."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                results = []
-                
-                # Build a single command string that maintains state
-                if working_directory:
-                    command_chain = f"cd {working_directory} && "
-                else:
-                    command_chain = ""
-                
-                # Chain all commands with && to ensure they run in sequence and stop on failure
-                command_chain += " && ".join(commands)
-                
-                self.logger.info(f"Executing chained commands: {command_chain}")
-                
-                # Execute the entire command chain in one go
+            results = []
+            
+            # Build a single command string that maintains state
+            if working_directory:
+                command_chain = f"cd {working_directory} && "
+            else:
+                command_chain = ""
+            
+            # Chain all commands with && to ensure they run in sequence and stop on failure
+            command_chain += " && ".join(commands)
+            
+            self.logger.info(f"Executing chained commands: {command_chain}")
+            
+            # Execute the entire command chain in one go, collecting both
+            # streams while waiting for the exit code
+            def run(ssh):
                 stdin, stdout, stderr = ssh.exec_command(command_chain, timeout=60)
-                
-                # Wait for completion and get exit code
-                exit_code = stdout.channel.recv_exit_status()
-                
-                # Read output
-                stdout_text = stdout.read().decode('utf-8', errors='replace')
-                stderr_text = stderr.read().decode('utf-8', errors='replace')
-                
-                # Format results
-                if exit_code == 0:
-                    results.append(f"✅ Command chain executed successfully (exit code: {exit_code})")
-                    if stdout_text:
-                        results.append(f"Output:\\n{stdout_text}")
-                else:
-                    results.append(f"❌ Command chain failed (exit code: {exit_code})")
-                    if stderr_text:
-                        results.append(f"Error:\\n{stderr_text}")
-                    if stdout_text:
-                        results.append(f"Output:\\n{stdout_text}")
-                
-                return f"Session execution completed:\\n\\n" + "\\n\\n".join(results)
+                return _drain_channel(
+                    stdout.channel, limit=_MAX_OUTPUT_BYTES, timeout=self.command_timeout
+                )
+            
+            exit_code, stdout_bytes, stderr_bytes = self.ssh_pool.run(run)
+            stdout_text = stdout_bytes.decode('utf-8', errors='replace')
+            stderr_text = stderr_bytes.decode('utf-8', errors='replace')
+            
+            # Format results
+            if exit_code == 0:
+                results.append(f"✅ Command chain executed successfully (exit code: {exit_code})")
+                if stdout_text:
+                    results.append(f"Output:\\n{stdout_text}")
+            else:
+                results.append(f"❌ Command chain failed (exit code: {exit_code})")
+                if stderr_text:
+                    results.append(f"Error:\\n{stderr_text}")
+                if stdout_text:
+                    results.append(f"Output:\\n{stdout_text}")
+            
+            return f"Session execution completed:\\n\\n" + "\\n\\n".join(results)
                 
         except paramiko.AuthenticationException:
             raise ConnectionError(os.environ.get("AWS_HOST", "unknown"), "SSH authentication failed")
@@ -958,83 +1777,176 @@ class RemoteMCPServer(AIShowmakerMCPServer):
         except Exception as e:
             raise Exception(f"Development workflow execution failed: {str(e)}")
     
+    def _resolve_remote_path(self, filename: str) -> str:
+        """Resolve a filename under the current repo or workspace (force POSIX paths)."""
+        base_dir = self.repo_manager.current_repo or self.repo_manager.workspace_path
+        return str(PurePosixPath(base_dir) / filename)
+    
+    def _ensure_remote_dirs(self, sftp: paramiko.SFTPClient, paths: List[str]) -> None:
+        """Create missing parent directories of the given paths over SFTP.
+        
+        Directories already created through this pool are skipped. Failures
+        are left for the following write to report.
+        """
+        known_dirs = self.ssh_pool._known_dirs
+        missing = sorted({str(PurePosixPath(p).parent) for p in paths} - known_dirs)
+        for directory in missing:
+            try:
+                _sftp_makedirs(sftp, directory)
+                known_dirs.add(directory)
+            except IOError:
+                pass
+    
+    def _put_file(self, sftp: paramiko.SFTPClient, target_path: str, data: bytes) -> None:
+        """Write data to target_path, recreating a cached parent directory that has gone.
+        
+        putfo pipelines the SFTP write requests. The size is known locally,
+        so putfo's confirming stat round trip is skipped.
+        """
+        try:
+            sftp.putfo(io.BytesIO(data), target_path, file_size=len(data), confirm=False)
+        except IOError:
+            # The parent may have been removed since it was cached (e.g. by an
+            # 'rm -rf' through execute_command); forget it and retry once
+            parent = str(PurePosixPath(target_path).parent)
+            if parent not in self.ssh_pool._known_dirs:
+                raise
+            self.ssh_pool._known_dirs.discard(parent)
+            self._ensure_remote_dirs(sftp, [target_path])
+            sftp.putfo(io.BytesIO(data), target_path, file_size=len(data), confirm=False)
+    
     async def _write_file(self, filename: str, content: str) -> str:
         """Write file to remote server via SFTP."""
         try:
             # Validate filename for security
             filename = validate_filename(filename)
             
-            with self.ssh_pool.get_connection() as ssh:
-                sftp = ssh.open_sftp()
-                
-                # Resolve a safe absolute target path under current repo or workspace (force POSIX paths)
-                from pathlib import PurePosixPath
-                base_dir = self.repo_manager.current_repo or self.repo_manager.workspace_path
-                target_path = str(PurePosixPath(base_dir) / filename)
-
-                # Ensure parent directories exist
-                parent_dir = str(PurePosixPath(target_path).parent)
-                try:
-                    ssh.exec_command(f"mkdir -p {parent_dir}")
-                except Exception:
-                    pass
-                
-                # Write file
-                with sftp.open(target_path, 'w') as f:
-                    f.write(content)
-                
-                # Get file size for confirmation
-                stat = sftp.stat(target_path)
-                file_size = stat.st_size
-                
-                sftp.close()
+            target_path = self._resolve_remote_path(filename)
+            data = content.encode('utf-8')
+            file_size = len(data)
+            
+            def write(conn):
+                ssh, sftp = conn
+                self._ensure_remote_dirs(sftp, [target_path])
+                self._put_file(sftp, target_path, data)
+            
+            await self._run_blocking(self.ssh_pool.run, write, handle='sftp')
+            
+            self.logger.info(f"Wrote file: {target_path} ({file_size} bytes)")
+            return f"File '{target_path}' written successfully ({file_size} bytes)"
                 
-                self.logger.info(f"Wrote file: {target_path} ({file_size} bytes)")
-                return f"File '{target_path}' written successfully ({file_size} bytes)"
+        except SecurityError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"File write failed: {str(e)}")
+    
+    def _write_files_bulk(self, ssh: paramiko.SSHClient, targets: List[Tuple[str, bytes]]) -> None:
+        """Write files by extracting one in-memory tar archive on the remote side.
+        
+        A single exec replaces a round trip per file; tar also creates any
+        missing parent directories. Files get mode 0644 (less the remote umask).
+        """
+        buffer = io.BytesIO()
+        now = time.time()
+        with tarfile.open(fileobj=buffer, mode='w') as archive:
+            for target_path, data in targets:
+                info = tarfile.TarInfo(target_path)
+                info.size = len(data)
+                info.mode = 0o644
+                info.mtime = now
+                archive.addfile(info, io.BytesIO(data))
+        
+        # -P keeps absolute member names; relative ones land in the login
+        # directory, as with SFTP
+        stdin, stdout, stderr = ssh.exec_command("tar -xPf -")
+        # Send 32 KiB slices of the archive buffer rather than a full copy of it
+        view = buffer.getbuffer()
+        for offset in range(0, len(view), _SFTP_REQUEST_SIZE):
+            stdin.channel.sendall(bytes(view[offset:offset + _SFTP_REQUEST_SIZE]))
+        view.release()
+        stdin.channel.shutdown_write()
+        exit_code, _, error = _drain_channel(stdout.channel)
+        if exit_code != 0:
+            raise Exception(f"tar extraction failed: {error.decode('utf-8', errors='replace')}")
+    
+    async def _write_files(self, files: List[Dict[str, str]]) -> str:
+        """Write several files over a single connection and SFTP session."""
+        try:
+            # Validate every filename before touching the remote server
+            targets = []
+            for entry in files:
+                filename = validate_filename(entry['filename'])
+                targets.append((self._resolve_remote_path(filename), entry.get('content', '').encode('utf-8')))
+            
+            def write_all(conn):
+                ssh, sftp = conn
+                self._ensure_remote_dirs(sftp, [path for path, _ in targets])
+                for target_path, data in targets:
+                    self._put_file(sftp, target_path, data)
+            
+            if len(targets) >= _TAR_BATCH_MIN_FILES:
+                await self._run_blocking(self.ssh_pool.run, lambda ssh: self._write_files_bulk(ssh, targets))
+            else:
+                await self._run_blocking(self.ssh_pool.run, write_all, handle='sftp')
+            
+            lines = [f"  {target_path} ({len(data)} bytes)" for target_path, data in targets]
+            total_size = sum(len(data) for _, data in targets)
+            
+            self.logger.info(f"Wrote {len(targets)} files ({total_size} bytes)")
+            return f"Wrote {len(targets)} files successfully ({total_size} bytes):\n" + "\n".join(lines)
                 
         except SecurityError as e:
             raise e
+        except KeyError as e:
+            raise Exception(f"File write failed: missing key {e} in files entry")
         except Exception as e:
             raise Exception(f"File write failed: {str(e)}")
     
     async def _read_file(self, filename: str) -> str:
         """Read file from remote server via SFTP."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                sftp = ssh.open_sftp()
-                
-                try:
-                    from pathlib import PurePosixPath
-                    base_dir = self.repo_manager.current_repo or self.repo_manager.workspace_path
-                    target_path = str(PurePosixPath(base_dir) / filename)
-                    with sftp.open(target_path, 'r') as f:
-                        content = f.read()
-                    
-                    self.logger.info(f"Read file: {target_path} ({len(content)} bytes)")
-                    return content
-                    
-                except FileNotFoundError:
-                    raise Exception(f"File '{target_path}' not found")
-                finally:
-                    sftp.close()
+            target_path = self._resolve_remote_path(filename)
+            
+            def read(conn):
+                ssh, sftp = conn
+                # Read at most one byte past the cap to detect truncation;
+                # the buffer matches the 32 KiB SFTP request size
+                with sftp.open(target_path, 'rb', bufsize=_SFTP_REQUEST_SIZE) as f:
+                    # Queue every needed read request at once instead of
+                    # waiting a round trip per 32 KiB chunk
+                    wanted = min(f.stat().st_size, _MAX_OUTPUT_BYTES + 1)
+                    if wanted:
+                        f.prefetch(wanted)
+                    return f.read(_MAX_OUTPUT_BYTES + 1)
+            
+            try:
+                data = await self._run_blocking(self.ssh_pool.run, read, handle='sftp')
+            except FileNotFoundError:
+                raise Exception(f"File '{target_path}' not found")
+            
+            content = data[:_MAX_OUTPUT_BYTES].decode('utf-8', errors='replace')
+            if len(data) > _MAX_OUTPUT_BYTES:
+                content += "\n" + _TRUNCATED_MARKER
+            
+            self.logger.info(f"Read file: {target_path} ({len(content)} bytes)")
+            return content
                     
         except Exception as e:
             raise Exception(f"File read failed: {str(e)}")
     
     async def _list_directory(self, path: str = ".") -> str:
-        """List directory contents on remote server."""
+        """List directory contents on remote server via SFTP."""
         try:
-            with self.ssh_pool.get_connection() as ssh:
-                stdin, stdout, stderr = ssh.exec_command(f"ls -la {path}")
-                exit_code = stdout.channel.recv_exit_status()
-                
-                if exit_code == 0:
-                    output = stdout.read().decode('utf-8', errors='replace')
-                    self.logger.info(f"Listed directory: {path}")
-                    return output
-                else:
-                    error = stderr.read().decode('utf-8', errors='replace')
-                    raise Exception(f"Directory listing failed: {error}")
+            entries = await self._run_blocking(
+                self.ssh_pool.run, lambda conn: conn[1].listdir_attr(path), handle='sftp'
+            )
+            
+            entries.sort(key=lambda e: e.filename)
+            # The server's own 'ls -l' style line, as the old 'ls -la' output;
+            # paramiko formats one itself if the server sent none
+            output = "\n".join(getattr(e, 'longname', None) or str(e) for e in entries)
+            self.logger.info(f"Listed directory: {path}")
+            return _cap_text(output)
                     
         except Exception as e:
             raise Exception(f"Directory listing failed: {str(e)}")
@@ -1042,10 +1954,17 @@ class RemoteMCPServer(AIShowmakerMCPServer):
     async def shutdown(self) -> None:
         """Shutdown the remote server."""
         self.logger.info("Remote MCP Server shutting down")
-        # Close any active connections
-        for conn_info in self.ssh_pool.connections.values():
-            try:
-                conn_info['client'].close()
-            except:
-                pass
-        self.ssh_pool.connections.clear()
+        # Close all pooled connections at once; each close may wait on the peer
+        clients = self.ssh_pool.detach_all()
+        await asyncio.gather(
+            *(self._run_blocking(self._close_client, client) for client in clients),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    def _close_client(client: paramiko.SSHClient) -> None:
+        """Close a client, giving an unresponsive peer two seconds at most."""
+        transport = client.get_transport()
+        if transport is not None and transport.sock is not None:
+            transport.sock.settimeout(2)
+        client.close()
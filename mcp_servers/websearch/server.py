@@ -7,19 +7,107 @@ No API keys required - completely self-contained web search functionality.
 """
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
+import operator
 import re
 import time
 import urllib.parse
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from ..base.server import AIShowmakerMCPServer
+from ..base.server import AIShowmakerMCPServer, MCPToolResult
+
+
+# BeautifulSoup backend: lxml's C parser (libxml2) instead of the pure-Python
+# 'html.parser'; lxml is already a declared dependency
+_HTML_PARSER = 'lxml'
+
+# Only result containers (class containing "result") are materialized on the
+# first parse of a DuckDuckGo page; the rest of the page is skipped
+_RESULT_STRAINER = SoupStrainer('div', attrs={'class': re.compile('result')})
+
+# Rate-limit key shared by all DuckDuckGo endpoints (html., lite, ac/)
+_DUCKDUCKGO_HOST = 'duckduckgo.com'
+
+# JSONP wrapper around DuckDuckGo autocomplete responses, and the quoted-string
+# fallback used when the payload inside it is not valid JSON
+_JSONP_PREFIX = b'ddg_spice_autocomplete('
+_JSONP_SUFFIX = b');'
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+
+# Links that leave DuckDuckGo (absolute http(s) URLs on another site)
+_EXTERNAL_HREF_RE = re.compile(r'^http(?!s://duckduckgo\.com)')
+
+# Phrase of an autocomplete item, as a C-level callable for the parse loop
+_get_phrase = operator.itemgetter('phrase')
+
+# Generic suggestions offered when the autocomplete API returns nothing usable
+_FALLBACK_SUFFIXES = (" tutorial", " examples", " guide", " documentation", " best practices")
+
+# Upper bound on bytes read from a page before it is parsed
+_MAX_PAGE_BYTES = 512 * 1024
+
+
+# (epoch second, ISO string) last formatted by _iso_now
+_timestamp_cache = (0, "")
+
+
+def _iso_now() -> str:
+    """Return the current local time as an ISO 8601 string, formatted once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
+# JSON decoder for API responses: orjson when it is installed, else the stdlib
+# parser. orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+# catch the same exception either way.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _unwrap_ddg_url(href: str) -> str:
+    """Return the target of a DuckDuckGo /l/?uddg=... redirect link, else href unchanged."""
+    parts = urllib.parse.urlsplit(href)
+    if parts.path != '/l/' or (parts.netloc and not parts.netloc.endswith('duckduckgo.com')):
+        return href
+    # parse_qs already percent-decodes the values
+    query = urllib.parse.parse_qs(parts.query)
+    target = query.get('uddg') or query.get('u')
+    return target[0] if target else href
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_css(selector: str):
+    """Compile a CSS selector once and reuse it across calls."""
+    return soupsieve.compile(selector)
+
+
+def _find_first(element, lookups):
+    """Return the first non-empty match for a sequence of find/CSS lookups."""
+    for lookup in lookups:
+        if isinstance(lookup, dict):
+            found = element.find(**lookup)
+        else:
+            found = _compile_css(lookup).select_one(element)
+        if found:
+            return found
+    return None
 
 
 @dataclass
@@ -50,16 +138,79 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
     Provides web search capabilities without requiring API keys.
     """
     
+    # Element lookups, tried in order. Plain strings are CSS selectors;
+    # dicts are keyword arguments for Tag.find, which skips CSS compilation.
+    # Selectors shadowed by an earlier, broader one have been dropped.
+    _CONTAINER_SELECTORS = (
+        'div.result',
+        'div.web-result',
+        'div[data-testid="result"]',
+        'div.result__body',
+        'div[class*="result"]',
+    )
+    # The first entry of the title, snippet and source lookups is the
+    # current DuckDuckGo markup, so the common case stops after one find()
+    _TITLE_LOOKUPS = (
+        {'name': 'a', 'class_': 'result__a'},
+        {'name': 'a', 'class_': 'result__title'},
+        {'name': 'a', 'attrs': {'data-testid': 'result-title'}},
+        'h3 a',
+        'a[class*="title"]',
+        {'name': 'a'},  # Fallback: any link in the container
+    )
+    _SNIPPET_LOOKUPS = (
+        {'class_': 'result__snippet'},
+        {'class_': 'result__a'},
+        {'name': 'p'},
+        {'class_': 'snippet'},
+        {'class_': 'web-result__snippet'},
+        {'class_': 'result__body'},  # The entire result body as fallback
+    )
+    _SOURCE_LOOKUPS = (
+        {'class_': 'result__url'},
+        {'class_': 'result__domain'},
+        {'class_': 'url'},
+        {'class_': 'web-result__url'},
+    )
+    _CONTENT_LOOKUPS = (
+        {'name': 'main'},
+        {'name': 'article'},
+        {'attrs': {'role': 'main'}},
+        {'class_': 'content'},
+        {'class_': 'main-content'},
+        {'id': 'content'},
+        {'id': 'main'},
+        {'class_': 'post-content'},
+        {'class_': 'entry-content'},
+    )
+    
     def __init__(self):
         """Initialize the web search MCP server."""
         super().__init__("websearch", version="1.0.0", description="Web Search MCP Server using DuckDuckGo scraping")
         self.logger = logging.getLogger("mcp.websearch")
         
         # Rate limiting and caching
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # 1 second between requests
-        self.cache = {}
-        self.cache_duration = timedelta(hours=1)
+        self.min_request_interval = 1.0  # 1 second between requests to the same host
+        self._host_next_allowed: Dict[str, float] = {}  # host -> monotonic time of next free slot
+        self._inflight: Dict[tuple, asyncio.Future] = {}  # (loop, cache key) -> fetch in progress
+        self.max_concurrent_extractions = 3  # Page fetches in flight per search_and_extract call
+        self.cache: OrderedDict = OrderedDict()  # key -> (expires_at, data), oldest use first
+        self.cache_duration = 3600.0  # seconds
+        self.max_cache_entries = 1024
+        self._cache_expiry: List[tuple] = []  # min-heap of (expires_at, key)
+        
+        # Shared copies of strings that repeat across cached results
+        # (domains, page languages)
+        self._interned: Dict[str, str] = {}
+        self.max_interned = 10000
+        
+        # One HTTP session per running event loop, so connections (and their
+        # TLS handshakes) are reused by every request on that loop. A session
+        # is bound to the loop that created it, and the bridge runs each tool
+        # call on its own loop, so a loop's session is closed once its last
+        # tool call finishes.
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._loop_calls: Dict[asyncio.AbstractEventLoop, int] = {}
         
         # User agents for rotation
         self.user_agents = [
@@ -69,6 +220,48 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:89.0) Gecko/20100101 Firefox/89.0'
         ]
+        
+        # Request headers are built once per user agent and rotated per request
+        self._search_headers = itertools.cycle([
+            {
+                'User-Agent': user_agent,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'none',
+                'Cache-Control': 'max-age=0',
+                'DNT': '1'
+            }
+            for user_agent in self.user_agents
+        ])
+        self._page_headers = itertools.cycle([
+            {
+                'User-Agent': user_agent,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+            }
+            for user_agent in self.user_agents
+        ])
+        self._suggestion_headers = itertools.cycle([
+            {
+                'User-Agent': user_agent,
+                'Accept': 'application/javascript, application/json, text/javascript, */*; q=0.01',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate',  # Removed 'br' to avoid Brotli issues
+                'Connection': 'keep-alive',
+                'Referer': 'https://duckduckgo.com/',
+                'Sec-Fetch-Dest': 'empty',
+                'Sec-Fetch-Mode': 'cors',
+                'Sec-Fetch-Site': 'same-origin'
+            }
+            for user_agent in self.user_agents
+        ])
     
     async def initialize(self) -> None:
         """Initialize the web search MCP server and register tools."""
@@ -156,8 +349,30 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
         self.logger.info("Shutting down Web Search MCP Server")
         # Clear cache
         self.cache.clear()
+        self._cache_expiry.clear()
+        self._interned.clear()
+        # Close pooled HTTP connections; sessions of other (finished) loops
+        # cannot be awaited from here and are dropped
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+        self._sessions.clear()
         self.logger.info("Web Search MCP Server shutdown complete")
     
+    async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> MCPToolResult:
+        """Execute a tool, closing the loop's HTTP session after its last call."""
+        loop = asyncio.get_running_loop()
+        self._loop_calls[loop] = self._loop_calls.get(loop, 0) + 1
+        try:
+            return await super().execute_tool(tool_name, arguments)
+        finally:
+            self._loop_calls[loop] -= 1
+            if not self._loop_calls[loop]:
+                del self._loop_calls[loop]
+                session = self._sessions.pop(loop, None)
+                if session is not None:
+                    await session.close()
+    
     async def search_web(self, query: str, max_results: int = 5, region: str = "us-en") -> Dict[str, Any]:
         """
         Search the web using DuckDuckGo.
@@ -178,24 +393,14 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             max_results = min(max(1, max_results), 10)  # Limit to 1-10 results
             
             # Check cache first
-            cache_key = f"search:{query}:{max_results}:{region}"
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < self.cache_duration:
-                    self.logger.info(f"Returning cached search results for: {query}")
-                    return cached_result['data']
+            cache_key = ('search', query, max_results, region)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Returning cached search results for: {query}")
+                return cached
             
-            # Rate limiting
-            await self._rate_limit()
-            
-            # Perform search
-            results = await self._search_duckduckgo(query, max_results, region)
-            
-            # Cache results
-            self.cache[cache_key] = {
-                'data': results,
-                'timestamp': datetime.now()
-            }
+            # Perform search (rate limited, cached, shared with identical in-flight calls)
+            results = await self._fetch_once(cache_key, _DUCKDUCKGO_HOST, self._search_duckduckgo, query, max_results, region)
             
             self.logger.info(f"Search completed for '{query}': {len(results.get('results', []))} results")
             return results
@@ -221,24 +426,14 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                 return {"error": "Invalid URL provided"}
             
             # Check cache first
-            cache_key = f"content:{url}:{max_length}"
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < self.cache_duration:
-                    self.logger.info(f"Returning cached content for: {url}")
-                    return cached_result['data']
-            
-            # Rate limiting
-            await self._rate_limit()
-            
-            # Extract content
-            content = await self._extract_web_content(url, max_length)
+            cache_key = ('content', url, max_length)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Returning cached content for: {url}")
+                return cached
             
-            # Cache results
-            self.cache[cache_key] = {
-                'data': content,
-                'timestamp': datetime.now()
-            }
+            # Extract content (rate limited, cached, shared with identical in-flight calls)
+            content = await self._fetch_once(cache_key, urllib.parse.urlsplit(url).netloc, self._extract_web_content, url, max_length)
             
             self.logger.info(f"Content extraction completed for: {url}")
             return content
@@ -267,12 +462,11 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             max_results = min(max(1, max_results), 5)  # Limit to 1-5 results
             
             # Check cache first
-            cache_key = f"search_extract:{query}:{max_results}:{max_content_length}"
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < self.cache_duration:
-                    self.logger.info(f"Returning cached search and extract results for: {query}")
-                    return cached_result['data']
+            cache_key = ('search_extract', query, max_results, max_content_length)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Returning cached search and extract results for: {query}")
+                return cached
             
             # Perform search
             search_results = await self.search_web(query, max_results)
@@ -280,40 +474,43 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             if "error" in search_results:
                 return search_results
             
-            # Extract content from each result
+            # Extract content from all results concurrently, bounded so a
+            # single call never opens more than a few page fetches at once
+            semaphore = asyncio.Semaphore(self.max_concurrent_extractions)
+            
+            async def extract(url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.extract_content(url, max_content_length)
+            
+            search_hits = search_results.get('results', [])
+            contents = await asyncio.gather(
+                *(extract(result['url']) for result in search_hits),
+                return_exceptions=True
+            )
+            
             enhanced_results = []
-            for result in search_results.get('results', []):
-                try:
-                    content = await self.extract_content(result['url'], max_content_length)
-                    if "error" not in content:
-                        result['extracted_content'] = content.get('text_content', '')
-                        result['page_title'] = content.get('title', result['title'])
-                    else:
-                        result['extracted_content'] = f"Content extraction failed: {content['error']}"
-                        result['page_title'] = result['title']
-                    
-                    enhanced_results.append(result)
-                    
-                    # Small delay between extractions
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to extract content from {result['url']}: {str(e)}")
-                    result['extracted_content'] = f"Content extraction failed: {str(e)}"
-                    enhanced_results.append(result)
+            for result, content in zip(search_hits, contents):
+                if isinstance(content, Exception):
+                    self.logger.warning(f"Failed to extract content from {result['url']}: {str(content)}")
+                    result['extracted_content'] = f"Content extraction failed: {str(content)}"
+                elif "error" not in content:
+                    result['extracted_content'] = content.get('text_content', '')
+                    result['page_title'] = content.get('title', result['title'])
+                else:
+                    result['extracted_content'] = f"Content extraction failed: {content['error']}"
+                    result['page_title'] = result['title']
+                
+                enhanced_results.append(result)
             
             results = {
                 "query": query,
                 "results": enhanced_results,
                 "total_results": len(enhanced_results),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _iso_now()
             }
             
             # Cache results
-            self.cache[cache_key] = {
-                'data': results,
-                'timestamp': datetime.now()
-            }
+            self._cache_set(cache_key, results)
             
             self.logger.info(f"Search and extract completed for '{query}': {len(enhanced_results)} results processed")
             return results
@@ -341,24 +538,14 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             max_suggestions = min(max(1, max_suggestions), 10)
             
             # Check cache first
-            cache_key = f"suggestions:{query}:{max_suggestions}"
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if datetime.now() - cached_result['timestamp'] < self.cache_duration:
-                    self.logger.info(f"Returning cached suggestions for: {query}")
-                    return cached_result['data']
+            cache_key = ('suggestions', query, max_suggestions)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Returning cached suggestions for: {query}")
+                return cached
             
-            # Rate limiting
-            await self._rate_limit()
-            
-            # Get suggestions
-            suggestions = await self._get_duckduckgo_suggestions(query, max_suggestions)
-            
-            # Cache results
-            self.cache[cache_key] = {
-                'data': suggestions,
-                'timestamp': datetime.now()
-            }
+            # Get suggestions (rate limited, cached, shared with identical in-flight calls)
+            suggestions = await self._fetch_once(cache_key, _DUCKDUCKGO_HOST, self._get_duckduckgo_suggestions, query, max_suggestions)
             
             self.logger.info(f"Suggestions retrieved for '{query}': {len(suggestions.get('suggestions', []))} suggestions")
             return suggestions
@@ -369,8 +556,6 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
     
     async def _search_duckduckgo(self, query: str, max_results: int, region: str) -> Dict[str, Any]:
         """Perform DuckDuckGo search using HTML scraping."""
-        import random
-        
         # Try multiple DuckDuckGo endpoints
         endpoints = [
             "https://html.duckduckgo.com/html/",
@@ -378,19 +563,7 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             "https://duckduckgo.com/lite/"
         ]
         
-        headers = {
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0',
-            'DNT': '1'
-        }
+        headers = next(self._search_headers)
         
         html = None
         last_error = None
@@ -404,22 +577,24 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                     'kp': '1'  # Safe search off
                 }
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(endpoint, params=params, headers=headers, timeout=30) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            break
-                        elif response.status == 202:
-                            # DuckDuckGo is rate limiting, try next endpoint
-                            last_error = f"Rate limited by {endpoint}"
-                            continue
-                        else:
-                            last_error = f"HTTP {response.status}: {response.reason} from {endpoint}"
+                async with self._get_session().get(endpoint, params=params, headers=headers, timeout=30) as response:
+                    if response.status == 200:
+                        html = await response.text()
+                        break
+                    elif response.status == 202:
+                        # DuckDuckGo is rate limiting, try next endpoint
+                        last_error = f"Rate limited by {endpoint}"
+                        continue
+                    else:
+                        last_error = f"HTTP {response.status}: {response.reason} from {endpoint}"
                             
             except Exception as e:
                 last_error = f"Error with {endpoint}: {str(e)}"
                 continue
         
+        # One timestamp shared by the response and every result in it
+        timestamp = _iso_now()
+        
         if not html:
             # If all endpoints fail, return mock results for testing
             self.logger.warning(f"All DuckDuckGo endpoints failed. Last error: {last_error}")
@@ -431,34 +606,69 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                         'url': f"https://example.com/search?q={urllib.parse.quote(query)}",
                         'snippet': f"This is a mock search result for '{query}' since DuckDuckGo is not accessible.",
                         'source': 'Mock (DuckDuckGo unavailable)',
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': timestamp
                     }
                 ],
                 "total_results": 1,
                 "source": "Mock (DuckDuckGo unavailable)",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
         
-        # Parse results
-        soup = BeautifulSoup(html, 'html.parser')
-        results = []
+        # Parse off the event loop so concurrent requests keep flowing
+        results = await self._run_blocking(self._parse_search_html, html, query, max_results, timestamp)
         
-        # Try multiple selectors for DuckDuckGo results
-        selectors = [
-            'div.result',
-            'div.web-result',
-            'div[data-testid="result"]',
-            'div.result__body',
-            'div[class*="result"]',
-            'div[class*="web-result"]',
-            'div[class*="result__"]'
-        ]
+        return {
+            "query": query,
+            "results": results,
+            "total_results": len(results),
+            "source": "DuckDuckGo",
+            "timestamp": timestamp
+        }
+    
+    async def _extract_web_content(self, url: str, max_length: int) -> Dict[str, Any]:
+        """Extract content from a web page."""
+        headers = next(self._page_headers)
         
+        async with self._get_session().get(url, headers=headers, timeout=30) as response:
+            if response.status != 200:
+                raise Exception(f"HTTP {response.status}: {response.reason}")
+            
+            # Read at most _MAX_PAGE_BYTES; text past that is beyond anything
+            # max_length would keep
+            chunks = []
+            total = 0
+            async for chunk in response.content.iter_chunked(65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= _MAX_PAGE_BYTES:
+                    break
+            html = b''.join(chunks)
+            if total >= _MAX_PAGE_BYTES:
+                # End on a tag boundary so no multi-byte character is cut in
+                # half, which would throw off encoding detection
+                cut = html.rfind(b'<')
+                if cut > 0:
+                    html = html[:cut]
+            charset = response.charset
+        
+        # Parse off the event loop so concurrent requests keep flowing
+        return await self._run_blocking(self._parse_page_html, html, url, max_length, charset)
+    
+    def _parse_search_html(self, html: str, query: str, max_results: int, timestamp: str) -> List[Dict[str, Any]]:
+        """Parse a DuckDuckGo results page into result dicts (runs in the executor)."""
+        results = []
+        
+        # Parse only the result containers first; fall back to the full page
+        # for layouts without a "result" class and for the link scan below
         result_containers = []
-        for selector in selectors:
-            result_containers = soup.select(selector)
+        for parse_only in (_RESULT_STRAINER, None):
+            soup = BeautifulSoup(html, _HTML_PARSER, parse_only=parse_only)
+            for selector in self._CONTAINER_SELECTORS:
+                result_containers = _compile_css(selector).select(soup)
+                if result_containers:
+                    self.logger.info(f"Found {len(result_containers)} results using selector: {selector}")
+                    break
             if result_containers:
-                self.logger.info(f"Found {len(result_containers)} results using selector: {selector}")
                 break
         
         self.logger.info(f"Total result containers found: {len(result_containers)}")
@@ -466,8 +676,8 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
         # If no results found, try alternative approach
         if not result_containers:
             # Look for any links that might be search results
-            links = soup.find_all('a', href=True)
-            for link in links[:max_results]:
+            links = soup.find_all('a', href=True, limit=max_results)
+            for link in links:
                 href = link.get('href', '')
                 if href.startswith('http') and not href.startswith('https://duckduckgo.com'):
                     title = link.get_text(strip=True)
@@ -477,30 +687,13 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                             'url': href,
                             'snippet': f"Found via search for: {query}",
                             'source': 'DuckDuckGo',
-                            'timestamp': datetime.now().isoformat()
+                            'timestamp': timestamp
                         })
         else:
             for container in result_containers[:max_results]:
                 try:
-                    # Try multiple selectors for title and URL - updated for current DuckDuckGo structure
-                    title_selectors = [
-                        'a.result__title', 
-                        'a[data-testid="result-title"]', 
-                        'h3 a', 
-                        'a[class*="title"]',
-                        'a[class*="result__title"]',
-                        'a[class*="web-result__title"]',
-                        'a',  # Fallback: any link in the container
-                        'h2 a',  # Another common pattern
-                        'h3 a',  # Another common pattern
-                        'h4 a'   # Another common pattern
-                    ]
-                    title_elem = None
-                    for selector in title_selectors:
-                        title_elem = container.select_one(selector)
-                        if title_elem:
-                            break
-                    
+                    # Try multiple lookups for title and URL - updated for current DuckDuckGo structure
+                    title_elem = _find_first(container, self._TITLE_LOOKUPS)
                     if not title_elem:
                         continue
                     
@@ -508,110 +701,53 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                     url = title_elem.get('href', '')
                     
                     # Clean URL (remove DuckDuckGo redirect)
-                    if url.startswith('/l/?uddg='):
-                        url = urllib.parse.unquote(url.split('uddg=')[1])
-                    elif url.startswith('/l/?u='):
-                        url = urllib.parse.unquote(url.split('u=')[1])
+                    url = _unwrap_ddg_url(url)
                     
-                    # Extract snippet - updated selectors
-                    snippet_selectors = [
-                        '.result__snippet', 
-                        '.result__a', 
-                        'p', 
-                        '.snippet',
-                        '.result__snippet',
-                        '.web-result__snippet',
-                        '.result__body p',  # Look for paragraphs in result body
-                        'p',  # Any paragraph
-                        '.result__body'  # The entire result body as fallback
-                    ]
-                    snippet = ""
-                    for selector in snippet_selectors:
-                        snippet_elem = container.select_one(selector)
-                        if snippet_elem:
-                            snippet = snippet_elem.get_text(strip=True)
-                            break
+                    # Extract snippet
+                    snippet_elem = _find_first(container, self._SNIPPET_LOOKUPS)
+                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
                     
-                    # Extract source - updated selectors
-                    source_selectors = [
-                        '.result__url', 
-                        '.result__domain', 
-                        '.url',
-                        '.web-result__url',
-                        '.result__body .result__url',  # Nested selector
-                        '.result__body .url'  # Nested selector
-                    ]
-                    source = ""
-                    for selector in source_selectors:
-                        source_elem = container.select_one(selector)
-                        if source_elem:
-                            source = source_elem.get_text(strip=True)
-                            break
+                    # Extract source
+                    source_elem = _find_first(container, self._SOURCE_LOOKUPS)
+                    source = source_elem.get_text(strip=True) if source_elem else ""
                     
                     # Additional validation and fallback
                     if not title or not url:
-                        # Try to find any link in the container
-                        all_links = container.find_all('a', href=True)
-                        for link in all_links:
-                            href = link.get('href', '')
-                            if href.startswith('http') and not href.startswith('https://duckduckgo.com'):
-                                if not title:
-                                    title = link.get_text(strip=True)
-                                if not url:
-                                    url = href
-                                    # Clean URL
-                                    if url.startswith('/l/?uddg='):
-                                        url = urllib.parse.unquote(url.split('uddg=')[1])
-                                    elif url.startswith('/l/?u='):
-                                        url = urllib.parse.unquote(url.split('u=')[1])
-                                break
+                        # Try the first external link in the container
+                        link = container.find('a', href=_EXTERNAL_HREF_RE)
+                        if link:
+                            if not title:
+                                title = link.get_text(strip=True)
+                            if not url:
+                                url = link['href']
                     
                     if title and url and url.startswith('http'):
                         results.append({
                             'title': title,
                             'url': url,
                             'snippet': snippet,
-                            'source': source,
-                            'timestamp': datetime.now().isoformat()
+                            'source': self._intern(source),
+                            'timestamp': timestamp
                         })
                         
                 except Exception as e:
                     self.logger.warning(f"Failed to parse result: {str(e)}")
                     continue
         
-        return {
-            "query": query,
-            "results": results,
-            "total_results": len(results),
-            "source": "DuckDuckGo",
-            "timestamp": datetime.now().isoformat()
-        }
+        return results
     
-    async def _extract_web_content(self, url: str, max_length: int) -> Dict[str, Any]:
-        """Extract content from a web page."""
-        import random
-        
-        headers = {
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=30) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}: {response.reason}")
-                
-                html = await response.text()
+    def _parse_page_html(self, html: bytes, url: str, max_length: int,
+                         charset: Optional[str] = None) -> Dict[str, Any]:
+        """Extract title, text and metadata from a web page (runs in the executor).
         
-        # Parse content
-        soup = BeautifulSoup(html, 'html.parser')
+        The raw bytes are decoded by BeautifulSoup, which tries the header
+        charset first and otherwise sniffs <meta> tags and the content.
+        """
+        soup = BeautifulSoup(html, _HTML_PARSER, from_encoding=charset)
         
         # Extract title
         title = ""
-        title_elem = soup.find('title')
+        title_elem = soup.title
         if title_elem:
             title = title_elem.get_text(strip=True)
         
@@ -625,31 +761,17 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
         content = ""
         
         # Try to find main content areas
-        content_selectors = [
-            'main',
-            'article',
-            '[role="main"]',
-            '.content',
-            '.main-content',
-            '#content',
-            '#main',
-            '.post-content',
-            '.entry-content'
-        ]
-        
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # Remove script and style elements
-                for script in content_elem(["script", "style"]):
-                    script.decompose()
-                
-                content = content_elem.get_text(separator=' ', strip=True)
-                break
+        content_elem = _find_first(soup, self._CONTENT_LOOKUPS)
+        if content_elem:
+            # Remove script and style elements
+            for script in content_elem(["script", "style"]):
+                script.decompose()
+            
+            content = content_elem.get_text(separator=' ', strip=True)
         
         # If no main content found, use body
         if not content:
-            body = soup.find('body')
+            body = soup.body
             if body:
                 # Remove script, style, nav, header, footer elements
                 for elem in body(["script", "style", "nav", "header", "footer", "aside"]):
@@ -657,7 +779,7 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
                 content = body.get_text(separator=' ', strip=True)
         
         # Clean and truncate content
-        content = re.sub(r'\s+', ' ', content).strip()
+        content = ' '.join(content.split())
         if len(content) > max_length:
             content = content[:max_length] + "..."
         
@@ -665,8 +787,8 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
         metadata = {
             'title': title,
             'meta_description': meta_desc,
-            'language': soup.get('lang', ''),
-            'charset': soup.meta.get('charset', '') if soup.meta else '',
+            'language': self._intern(soup.get('lang', '')),
+            'charset': self._intern(soup.meta.get('charset', '') if soup.meta else ''),
         }
         
         return {
@@ -675,13 +797,11 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             "content": content,
             "text_content": content,
             "metadata": metadata,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
     
     async def _get_duckduckgo_suggestions(self, query: str, max_suggestions: int) -> Dict[str, Any]:
         """Get search suggestions from DuckDuckGo."""
-        import random
-        
         # DuckDuckGo suggestions API - updated endpoint
         suggestions_url = "https://duckduckgo.com/ac/"
         params = {
@@ -691,86 +811,146 @@ class WebSearchMCPServer(AIShowmakerMCPServer):
             'callback': 'ddg_spice_autocomplete'
         }
         
-        headers = {
-            'User-Agent': random.choice(self.user_agents),
-            'Accept': 'application/javascript, application/json, text/javascript, */*; q=0.01',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',  # Removed 'br' to avoid Brotli issues
-            'Connection': 'keep-alive',
-            'Referer': 'https://duckduckgo.com/',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin'
-        }
+        headers = next(self._suggestion_headers)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(suggestions_url, params=params, headers=headers, timeout=10) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}: {response.reason}")
-                
-                text = await response.text()
-                
-                # Handle JSONP response
-                if text.startswith('ddg_spice_autocomplete(') and text.endswith(');'):
-                    json_str = text[24:-2]  # Remove wrapper
-                    try:
-                        data = json.loads(json_str)
-                    except json.JSONDecodeError:
-                        # Fallback: try to extract suggestions manually
-                        data = []
-                        # Look for quoted strings in the response
-                        import re
-                        matches = re.findall(r'"([^"]+)"', text)
-                        data = [{"phrase": match} for match in matches if len(match) > 2]
-                else:
-                    # Try direct JSON parsing
-                    try:
-                        data = json.loads(text)
-                    except json.JSONDecodeError:
-                        data = []
+        async with self._get_session().get(suggestions_url, params=params, headers=headers, timeout=10) as response:
+            if response.status != 200:
+                raise Exception(f"HTTP {response.status}: {response.reason}")
+            
+            # Raw bytes go straight to the JSON parser, skipping charset
+            # detection and a str copy of the body
+            body = await response.read()
+        
+        # Handle JSONP response
+        if body.startswith(_JSONP_PREFIX) and body.endswith(_JSONP_SUFFIX):
+            json_bytes = body[len(_JSONP_PREFIX):-len(_JSONP_SUFFIX)]  # Remove wrapper
+            try:
+                data = _json_loads(json_bytes)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Fallback: look for quoted strings in the response
+                matches = _QUOTED_RE.findall(body.decode('utf-8', errors='replace'))
+                data = [{"phrase": match} for match in matches if len(match) > 2]
+        else:
+            # Try direct JSON parsing
+            try:
+                data = _json_loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                data = []
+    
+        if isinstance(data, dict):
+            data = data.get('suggestions', [])
         
         suggestions = []
         if isinstance(data, list):
             for item in data[:max_suggestions]:
-                if isinstance(item, dict) and 'phrase' in item:
-                    suggestions.append(item['phrase'])
-                elif isinstance(item, str):
-                    suggestions.append(item)
-        elif isinstance(data, dict) and 'suggestions' in data:
-            for item in data['suggestions'][:max_suggestions]:
-                if isinstance(item, dict) and 'phrase' in item:
-                    suggestions.append(item['phrase'])
-                elif isinstance(item, str):
-                    suggestions.append(item)
+                # Items are normally {"phrase": ...}; plain strings are accepted too
+                try:
+                    suggestions.append(_get_phrase(item))
+                except (TypeError, KeyError):
+                    if isinstance(item, str):
+                        suggestions.append(item)
         
         # Fallback: generate simple suggestions if API fails
         if not suggestions:
-            base_suggestions = [
-                f"{query} tutorial",
-                f"{query} examples",
-                f"{query} guide",
-                f"{query} documentation",
-                f"{query} best practices"
-            ]
-            suggestions = base_suggestions[:max_suggestions]
+            suggestions = [query + suffix for suffix in _FALLBACK_SUFFIXES[:max_suggestions]]
         
         return {
             "query": query,
             "suggestions": suggestions,
             "total_suggestions": len(suggestions),
             "source": "DuckDuckGo",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _iso_now()
         }
     
-    async def _rate_limit(self):
-        """Implement rate limiting to be respectful to servers."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    def _cache_get(self, key: tuple) -> Optional[Any]:
+        """Return cached data for key, or None when missing or expired."""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return data
+    
+    def _cache_set(self, key: tuple, data: Any) -> None:
+        """Cache data under key, evicting expired and least recently used entries."""
+        self._sweep_expired()
+        expires_at = time.monotonic() + self.cache_duration
+        self.cache[key] = (expires_at, data)
+        self.cache.move_to_end(key)
+        heapq.heappush(self._cache_expiry, (expires_at, key))
+        while len(self.cache) > self.max_cache_entries:
+            self.cache.popitem(last=False)
+        # LRU evictions and overwrites leave stale heap entries behind
+        if len(self._cache_expiry) > 2 * self.max_cache_entries:
+            self._cache_expiry = [(entry[0], key) for key, entry in self.cache.items()]
+            heapq.heapify(self._cache_expiry)
+    
+    def _sweep_expired(self) -> None:
+        """Drop expired cache entries, touching only the keys that expired."""
+        now = time.monotonic()
+        while self._cache_expiry and self._cache_expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._cache_expiry)
+            entry = self.cache.get(key)
+            # Skip heap entries left over from a key that was since re-cached
+            if entry is not None and entry[0] == expires_at:
+                del self.cache[key]
+    
+    def _intern(self, value: str) -> str:
+        """Return a shared copy of value so repeated strings are stored once."""
+        interned = self._interned.get(value)
+        if interned is not None:
+            return interned
+        if len(self._interned) < self.max_interned:
+            self._interned[value] = value
+        return value
+    
+    async def _fetch_once(self, cache_key: tuple, host: str, fetch, *args) -> Any:
+        """Rate-limit, run and cache fetch(*args), sharing one run among concurrent callers with the same key."""
+        # Tasks can only be awaited from their own loop, so sharing is per loop
+        inflight_key = (asyncio.get_running_loop(), cache_key)
+        task = self._inflight.get(inflight_key)
+        if task is None:
+            async def run():
+                await self._rate_limit(host)
+                data = await fetch(*args)
+                self._cache_set(cache_key, data)
+                return data
+            
+            task = asyncio.ensure_future(run())
+            self._inflight[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        # Shielded so one caller timing out does not cancel the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _run_blocking(self, func, *args):
+        """Run blocking parse work in the executor so the event loop stays free."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the running loop's HTTP session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return session
+    
+    async def _rate_limit(self, host: str):
+        """Implement per-host rate limiting to be respectful to servers."""
+        # Reserve the host's next free slot before sleeping (no await in
+        # between, so this is atomic on the event loop); concurrent callers
+        # get consecutive slots and wait for them in parallel
+        now = time.monotonic()
+        slot = max(now, self._host_next_allowed.get(host, now))
+        self._host_next_allowed[host] = slot + self.min_request_interval
+        
+        if slot > now:
+            await asyncio.sleep(slot - now)
     
 